@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark do cálculo vetorizado do campo subquântico em grades 2D
+
+Mede o tempo de SubquantumField.compute_field_grid para grades crescentes,
+até ~10^7 pontos, e reporta a vazão em pontos por segundo.
+
+Uso:
+    python examples/benchmark_field_grid.py [--max-points 10000000]
+"""
+
+import sys
+import os
+import time
+import types
+import argparse
+import importlib
+
+# O __init__ de nmsi importa módulos ausentes desta árvore; um pacote nmsi
+# mínimo apontando para src/nmsi permite importar só nmsi.core (e os módulos
+# que ele importa de forma relativa) sem executá-lo
+NMSI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'nmsi')
+if 'nmsi' not in sys.modules:
+    package = types.ModuleType('nmsi')
+    package.__path__ = [NMSI_PATH]
+    sys.modules['nmsi'] = package
+
+core = importlib.import_module('nmsi.core')
+NMSIParameters, SubquantumField = core.NMSIParameters, core.SubquantumField
+
+
+def benchmark(max_points: int, repeats: int = 3):
+    """Executa o benchmark para grades de 10^4 até max_points pontos"""
+    field = SubquantumField(NMSIParameters())
+    extent = 10 * field.params.planck_scale
+
+    print(f"{'grade':>12} {'pontos':>12} {'tempo (s)':>10} {'pontos/s':>14}")
+    print("-" * 52)
+
+    # Grades com ~10^4, 10^4.5, ..., max_points pontos
+    n_points = 10_000
+    while n_points <= max_points * 1.001:
+        grid_size = int(round(n_points ** 0.5))
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            field.compute_field_grid((-extent, extent), (-extent, extent),
+                                     t=0.0, grid_size=grid_size)
+            best = min(best, time.perf_counter() - start)
+
+        total = grid_size * grid_size
+        print(f"{grid_size:>5}x{grid_size:<6} {total:>12,} {best:>10.3f} "
+              f"{total / best:>14,.0f}")
+        n_points *= 10 ** 0.5
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--max-points', type=int, default=10_000_000,
+                        help="Número máximo de pontos da grade (padrão: 10^7)")
+    parser.add_argument('--repeats', type=int, default=3,
+                        help="Repetições por tamanho de grade (melhor tempo)")
+    args = parser.parse_args()
+
+    benchmark(args.max_points, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,11 @@ from .framework import (
     SimulationEngine
 )
 
+from .scheduling import (
+    RoundScheduler,
+    ScheduleReport
+)
+
 from .parallax import (
     ParallaxCore,
     InferenceOrchestrator,
@@ -27,6 +32,8 @@ __all__ = [
     "ArkhenFramework",
     "FrameworkConfig",
     "SimulationEngine",
+    "RoundScheduler",
+    "ScheduleReport",
     "ParallaxCore",
     "InferenceOrchestrator", 
     "DistributedLLM",
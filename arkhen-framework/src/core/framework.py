@@ -22,6 +22,7 @@ import numpy as np
 # Imports dos módulos do framework
 from ..nmsi import NMSISimulator, NMSIParameters
 from ..quantum_blockchain import PoQCConsensus
+from .scheduling import RoundScheduler
 from ..quantum_synchronicity import QuantumSynchronizer, SyncParameter
 from ..universe_simulation import UniverseSimulator
 
@@ -32,10 +33,16 @@ class FrameworkConfig:
     
     # Configurações NMSI
     nmsi_params: NMSIParameters = field(default_factory=NMSIParameters)
+    nmsi_simulation_mode: str = "step"  # "step" ou "analytic"
     
     # Configurações Blockchain Quântico
     blockchain_lambda: float = 1.0
     blockchain_fraud_threshold: float = 0.7
+    blockchain_max_workers: Optional[int] = None  # None: rodadas no próprio laço de eventos
+    blockchain_executor: str = "thread"  # "thread" ou "process"
+    blockchain_schedule: str = "fixed"  # "fixed", "max" ou "target"
+    blockchain_round_interval: float = 1.0  # segundos, modo "fixed"
+    blockchain_target_rate: Optional[float] = None  # rodadas/s, modo "target"
     
     # Configurações Sincronicidade Quântica
     sync_params: SyncParameter = field(default_factory=SyncParameter)
@@ -92,12 +99,16 @@ class SimulationEngine:
         self.components['nmsi'] = NMSISimulator(self.config.nmsi_params)
         self.components['nmsi'].add_oscillator(1.0, 1.0)  # Oscilador fundamental
         self.components['nmsi'].add_oscillator(2.0, 0.5)  # Harmônico
+        # Apenas valores finais são lidos: histórico só ao fim de cada execução
+        self.components['nmsi'].set_observer_cadence('history', every=None, at_end=True)
         self.logger.info("✓ NMSI Simulator initialized")
         
         # 2. Blockchain Quântico
         self.components['blockchain'] = PoQCConsensus(
             lambda_param=self.config.blockchain_lambda,
-            fraud_threshold=self.config.blockchain_fraud_threshold
+            fraud_threshold=self.config.blockchain_fraud_threshold,
+            max_workers=self.config.blockchain_max_workers,
+            executor_type=self.config.blockchain_executor
         )
         # Registra validadores iniciais
         for i in range(min(5, self.config.max_nodes)):
@@ -179,7 +190,8 @@ class SimulationEngine:
         nmsi = self.components['nmsi']
         
         # Executa simulação
-        nmsi.run_simulation(duration, self.config.time_step)
+        nmsi.run_simulation(duration, self.config.time_step,
+                            mode=self.config.nmsi_simulation_mode)
         
         # Analisa resultados
         dark_matter_analysis = nmsi.analyze_dark_matter_signature()
@@ -189,21 +201,22 @@ class SimulationEngine:
             'final_coherence': nmsi.compute_average_coherence(),
             'dark_matter_analysis': dark_matter_analysis,
             'oscillator_count': len(nmsi.oscillators),
-            'simulation_steps': len(nmsi.history)
+            'simulation_steps': nmsi.step_count
         }
     
     async def _run_blockchain_consensus(self, duration: float) -> Dict:
         """Executa consenso blockchain quântico"""
         blockchain = self.components['blockchain']
         
-        # Executa múltiplas rodadas de consenso
-        rounds = int(duration / 1.0)  # 1 rodada por segundo
-        consensus_results = []
-        
-        for round_num in range(rounds):
-            result = await blockchain.run_consensus_round()
-            consensus_results.append(result)
-            await asyncio.sleep(1.0)  # Espera 1 segundo entre rodadas
+        # Executa múltiplas rodadas de consenso na cadência configurada
+        scheduler = RoundScheduler(
+            mode=self.config.blockchain_schedule,
+            interval=self.config.blockchain_round_interval,
+            target_rate=self.config.blockchain_target_rate
+        )
+        report = await scheduler.run(blockchain.run_consensus_round, duration)
+        consensus_results = report.results
+        rounds = report.rounds
         
         # Estatísticas finais
         successful_rounds = sum(1 for r in consensus_results if r['consensus_achieved'])
@@ -215,6 +228,8 @@ class SimulationEngine:
             'success_rate': successful_rounds / rounds if rounds > 0 else 0,
             'average_coherence': avg_coherence,
             'total_validators': len(blockchain.validators),
+            'rounds_per_second': report.rounds_per_second,
+            'round_latency': report.summary()['round_latency'],
             'fraud_detections': sum(len(r['fraud_detections']) for r in consensus_results)
         }
     
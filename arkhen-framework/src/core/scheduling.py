@@ -0,0 +1,138 @@
+"""
+Agendamento de rodadas assíncronas (ex.: consenso PoQC)
+
+Executa uma corrotina de rodada repetidamente durante uma duração, em um de
+três modos:
+- 'fixed': int(duration / interval) rodadas, com espera fixa entre elas
+- 'max': rodadas em sequência, sem espera, até esgotar a duração
+- 'target': taxa alvo de rodadas por segundo, com correção de deriva (cada
+  rodada é agendada num instante absoluto, não após a anterior)
+
+Em todos os modos são medidas a taxa obtida e a latência de cada rodada.
+"""
+
+import asyncio
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+SCHEDULER_MODES = ('fixed', 'max', 'target')
+
+
+@dataclass
+class ScheduleReport:
+    """Resultados e métricas de uma execução do RoundScheduler"""
+    mode: str
+    results: List[Any] = field(default_factory=list)
+    latencies: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rounds(self) -> int:
+        return len(self.results)
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.elapsed if self.elapsed > 0 else 0.0
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)) -> Dict[str, float]:
+        """Percentis da latência por rodada, em segundos"""
+        if not self.latencies:
+            return {f'p{p}': 0.0 for p in percentiles}
+        values = np.percentile(self.latencies, percentiles)
+        return {f'p{p}': float(v) for p, v in zip(percentiles, values)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Métricas de vazão e latência num dicionário"""
+        latency = self.latency_percentiles()
+        if self.latencies:
+            latency['mean'] = float(np.mean(self.latencies))
+            latency['max'] = float(np.max(self.latencies))
+        return {
+            'schedule_mode': self.mode,
+            'rounds': self.rounds,
+            'elapsed': self.elapsed,
+            'rounds_per_second': self.rounds_per_second,
+            'round_latency': latency
+        }
+
+
+class RoundScheduler:
+    """Executa rodadas assíncronas numa cadência fixa, máxima ou alvo"""
+
+    def __init__(self, mode: str = 'fixed', interval: float = 1.0,
+                 target_rate: Optional[float] = None,
+                 max_rounds: Optional[int] = None):
+        """
+        Args:
+            mode: 'fixed', 'max' ou 'target'
+            interval: Espera entre rodadas no modo 'fixed', em segundos
+            target_rate: Rodadas por segundo no modo 'target'
+            max_rounds: Limite opcional de rodadas em qualquer modo
+        """
+        if mode not in SCHEDULER_MODES:
+            raise ValueError(f"Unknown scheduler mode '{mode}', "
+                             f"expected one of {SCHEDULER_MODES}")
+        if mode == 'fixed' and interval <= 0:
+            raise ValueError("Fixed interval must be positive")
+        if mode == 'target' and (target_rate is None or target_rate <= 0):
+            raise ValueError("Target mode requires a positive target_rate")
+
+        self.mode = mode
+        self.interval = interval
+        self.target_rate = target_rate
+        self.max_rounds = max_rounds
+
+    async def run(self, round_fn: Callable[[], Awaitable[Any]],
+                  duration: float) -> ScheduleReport:
+        """
+        Executa rodadas durante `duration` segundos.
+
+        Args:
+            round_fn: Função sem argumentos que retorna a corrotina de uma rodada
+            duration: Duração total, em segundos
+
+        Returns:
+            ScheduleReport com os resultados de cada rodada e as métricas
+        """
+        report = ScheduleReport(self.mode)
+        start = time.perf_counter()
+
+        if self.mode == 'fixed':
+            # Comportamento original: número fixo de rodadas e espera entre elas
+            rounds = int(duration / self.interval)
+            if self.max_rounds is not None:
+                rounds = min(rounds, self.max_rounds)
+            for _ in range(rounds):
+                await self._timed_round(round_fn, report)
+                await asyncio.sleep(self.interval)
+        else:
+            period = 0.0 if self.mode == 'max' else 1.0 / self.target_rate
+            deadline = start + duration
+            next_start = start
+
+            while time.perf_counter() < deadline:
+                if self.max_rounds is not None and report.rounds >= self.max_rounds:
+                    break
+                await self._timed_round(round_fn, report)
+
+                next_start += period
+                now = time.perf_counter()
+                if now - next_start > period:
+                    # Atraso maior que um período: reagenda a partir de agora
+                    # em vez de disparar rodadas em rajada para compensar
+                    next_start = now
+                # Sempre cede o laço de eventos, mesmo sem espera
+                await asyncio.sleep(max(0.0, min(next_start, deadline) - now))
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    @staticmethod
+    async def _timed_round(round_fn: Callable[[], Awaitable[Any]], report: ScheduleReport):
+        round_start = time.perf_counter()
+        result = await round_fn()
+        report.latencies.append(time.perf_counter() - round_start)
+        report.results.append(result)
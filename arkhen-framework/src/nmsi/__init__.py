@@ -7,11 +7,19 @@ Este módulo fornece as fundações teóricas e computacionais para o Framework
 
 from .core import (
     SubquantumField,
+    SpatialKernel,
     InformationalOscillator,
+    OscillatorBank,
     CoherenceFunction,
     NMSISimulator
 )
 
+from .history import SimulationHistory
+from .sampling import CoherenceEstimator, CoherenceEstimate
+from .observers import SimulationObserver, MetricObserver
+from .phase_map import TiledPhaseMapEngine, PhaseStatistics
+from .ensemble import EnsembleRunner, EnsembleSettings, EnsembleResult
+
 from .equations import (
     compute_field_function,
     compute_coherence,
@@ -28,9 +36,21 @@ from .visualization import (
 __version__ = "2.0.0"
 __all__ = [
     "SubquantumField",
+    "SpatialKernel",
     "InformationalOscillator", 
+    "OscillatorBank",
     "CoherenceFunction",
     "NMSISimulator",
+    "SimulationHistory",
+    "CoherenceEstimator",
+    "CoherenceEstimate",
+    "SimulationObserver",
+    "MetricObserver",
+    "TiledPhaseMapEngine",
+    "PhaseStatistics",
+    "EnsembleRunner",
+    "EnsembleSettings",
+    "EnsembleResult",
     "compute_field_function",
     "compute_coherence",
     "compute_phase_difference",
@@ -7,11 +7,16 @@ Implementa as equações fundamentais:
 """
 
 import numpy as np
-from typing import Tuple, Optional, Callable
+from typing import Any, Dict, Tuple, Optional, Callable, Sequence, Union
 from dataclasses import dataclass
 import scipy.sparse as sp
 from scipy.integrate import odeint
 
+from .history import SimulationHistory
+from .sampling import CoherenceEstimate, CoherenceEstimator
+from .observers import MetricObserver, SimulationObserver
+from .phase_map import PhaseStatistics, TiledPhaseMapEngine
+
 
 @dataclass
 class NMSIParameters:
@@ -45,15 +50,18 @@ class SubquantumField:
         Calcula a função de campo em posição r e tempo t
         
         Args:
-            r: Posição (vetor 3D)
+            r: Posição (vetor 3D) ou array (..., 3) de posições
             t: Tempo
-            phase_func: Função de fase opcional ϕ(r,t)
+            phase_func: Função de fase opcional ϕ(r,t); deve aceitar o mesmo
+                formato de r e fazer broadcast sobre as posições
         
         Returns:
-            Valor complexo do campo Ψ(r,t)
+            Valor complexo do campo Ψ(r,t), ou array com o formato r.shape[:-1]
         """
-        # Produto escalar k·r
-        k_dot_r = np.dot(self.params.k_vector, r)
+        r = np.asarray(r, dtype=float)
+        
+        # Produto escalar k·r (broadcast sobre o último eixo)
+        k_dot_r = r @ self.params.k_vector
         
         # Fase adicional (se fornecida)
         additional_phase = phase_func(r, t) if phase_func else 0.0
@@ -74,19 +82,88 @@ class SubquantumField:
     def compute_field_grid(self, x_range: Tuple[float, float], 
                           y_range: Tuple[float, float],
                           t: float, grid_size: int = 100) -> np.ndarray:
-        """Calcula o campo em uma grade 2D"""
+        """Calcula o campo em uma grade 2D (plano z = 0)"""
         x = np.linspace(x_range[0], x_range[1], grid_size)
         y = np.linspace(y_range[0], y_range[1], grid_size)
-        X, Y = np.meshgrid(x, y)
         
-        field_grid = np.zeros((grid_size, grid_size), dtype=complex)
+        # Equivalente a meshgrid(x, y): linhas variam em y, colunas em x
+        positions = np.zeros((grid_size, grid_size, 3))
+        positions[..., 0] = x[np.newaxis, :]
+        positions[..., 1] = y[:, np.newaxis]
         
-        for i in range(grid_size):
-            for j in range(grid_size):
-                r = np.array([X[i, j], Y[i, j], 0.0])
-                field_grid[i, j] = self.compute_field(r, t)
-                
-        return field_grid
+        return self.compute_field(positions, t)
+    
+    def create_kernel(self, positions: np.ndarray) -> 'SpatialKernel':
+        """Cria um SpatialKernel com os fatores espaciais pré-calculados para positions"""
+        return SpatialKernel(self, positions)
+
+
+class SpatialKernel:
+    """
+    Conjunto fixo de posições com os fatores do campo que dependem só de r.
+    
+    Como Ψ(r,t) = Φ₀ exp(ik·r) Ω(r) · exp(-iωt) quando não há fase adicional,
+    exp(ik·r), o decaimento espacial exp(-|r|/planck_scale) e Ω(r) são
+    calculados uma única vez; avançar para um novo t custa apenas a
+    multiplicação pelo fator de fase temporal. O cache é refeito
+    automaticamente quando k_vector, planck_scale, phi_0 ou I_c mudam.
+    """
+    
+    def __init__(self, field: SubquantumField, positions: np.ndarray):
+        self.field = field
+        self.positions = np.asarray(positions, dtype=float)
+        self._params_key = None
+        self._spatial_decay = None
+        self._base_field = None
+    
+    def _current_params_key(self) -> tuple:
+        params = self.field.params
+        return (np.asarray(params.k_vector, dtype=float).tobytes(),
+                params.planck_scale, params.phi_0, params.I_c)
+    
+    def _refresh(self):
+        """Recalcula os fatores espaciais se os parâmetros mudaram"""
+        key = self._current_params_key()
+        if key == self._params_key:
+            return
+        
+        params = self.field.params
+        k_dot_r = self.positions @ params.k_vector
+        distance = np.linalg.norm(self.positions, axis=-1)
+        
+        self._spatial_decay = np.exp(-distance / params.planck_scale)
+        coherence = np.tanh(self._spatial_decay / params.I_c)
+        self._base_field = params.phi_0 * np.exp(1j * k_dot_r) * coherence
+        self._params_key = key
+    
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.positions.shape[:-1]
+    
+    @property
+    def spatial_decay(self) -> np.ndarray:
+        """Fator exp(-|r|/planck_scale) em cada posição"""
+        self._refresh()
+        return self._spatial_decay
+    
+    def compute_field(self, t: float) -> np.ndarray:
+        """Campo Ψ(r,t) em todas as posições do kernel"""
+        self._refresh()
+        return self._base_field * np.exp(-1j * self.field.params.omega * t)
+    
+    def compute_phase(self, t: float) -> np.ndarray:
+        """Fase arg Ψ(r,t) em todas as posições do kernel"""
+        return np.angle(self.compute_field(t))
+    
+    def compute_coherence(self, t: float, oscillators: list = None) -> np.ndarray:
+        """Função de coerência Ω(r,t) em todas as posições do kernel"""
+        decay = self.spatial_decay
+        if oscillators is None:
+            return np.tanh(decay / self.field.params.I_c)
+        
+        total_power = self.field.coherence_func.compute_oscillator_power(t, oscillators)
+        info_density = total_power * decay
+        return np.tanh(info_density / self.field.params.I_c)
 
 
 class InformationalOscillator:
@@ -114,6 +191,120 @@ class InformationalOscillator:
         return np.log2(self.amplitude + 1e-10)  # Evita log(0)
 
 
+class OscillatorBank:
+    """
+    Banco de osciladores informacionais armazenado em arrays NumPy contíguos.
+    
+    Equivalente a uma lista de InformationalOscillator, mas com frequências,
+    amplitudes e fases em arrays, de modo que evolução, valores e conteúdo
+    informacional são operações vetorizadas sobre todo o banco.
+    """
+    
+    def __init__(self, capacity: int = 16):
+        capacity = max(int(capacity), 1)
+        self._frequencies = np.zeros(capacity)
+        self._amplitudes = np.zeros(capacity)
+        self._phases = np.zeros(capacity)
+        self._size = 0
+    
+    @property
+    def frequencies(self) -> np.ndarray:
+        return self._frequencies[:self._size]
+    
+    @property
+    def amplitudes(self) -> np.ndarray:
+        return self._amplitudes[:self._size]
+    
+    @property
+    def phases(self) -> np.ndarray:
+        return self._phases[:self._size]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, index: int) -> InformationalOscillator:
+        """Retorna uma cópia do oscilador na posição index"""
+        if not -self._size <= index < self._size:
+            raise IndexError("oscillator index out of range")
+        index %= self._size
+        osc = InformationalOscillator(self._frequencies[index], self._amplitudes[index])
+        osc.phase = self._phases[index]
+        return osc
+    
+    def _reserve(self, capacity: int):
+        """Garante capacidade, crescendo geometricamente para inserções amortizadas"""
+        if capacity <= len(self._frequencies):
+            return
+        new_capacity = max(capacity, 2 * len(self._frequencies))
+        for name in ('_frequencies', '_amplitudes', '_phases'):
+            grown = np.zeros(new_capacity)
+            grown[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, grown)
+    
+    def add(self, frequencies: Union[float, np.ndarray],
+            amplitudes: Union[float, np.ndarray] = 1.0,
+            phases: Union[float, np.ndarray] = 0.0):
+        """
+        Adiciona um ou vários osciladores ao banco.
+        
+        Args:
+            frequencies: Frequência (escalar) ou array de frequências
+            amplitudes: Amplitude(s), com broadcast contra frequencies
+            phases: Fase(s) inicial(is), com broadcast contra frequencies
+        """
+        frequencies, amplitudes, phases = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(frequencies, dtype=float)),
+            np.asarray(amplitudes, dtype=float),
+            np.asarray(phases, dtype=float)
+        )
+        if frequencies.ndim != 1:
+            raise ValueError("Oscillator parameters must be scalars or 1D arrays")
+        
+        n_new = len(frequencies)
+        self._reserve(self._size + n_new)
+        
+        end = self._size + n_new
+        self._frequencies[self._size:end] = frequencies
+        self._amplitudes[self._size:end] = amplitudes
+        self._phases[self._size:end] = np.mod(phases, 2 * np.pi)
+        self._size = end
+    
+    def evolve(self, dt: float):
+        """Evolui todos os osciladores por um passo de tempo dt"""
+        self.advance(dt)
+    
+    def advance(self, duration: float):
+        """
+        Avança todas as fases analiticamente por um intervalo de tempo.
+        
+        A evolução é um avanço linear de fase módulo 2π, então n passos de dt
+        equivalem a um único avanço de n·dt.
+        """
+        phases = self.phases
+        phases += 2 * np.pi * self.frequencies * duration
+        np.mod(phases, 2 * np.pi, out=phases)
+    
+    def get_values(self, t: float) -> np.ndarray:
+        """Retorna os valores complexos de todos os osciladores no tempo t"""
+        return self.amplitudes * np.exp(1j * (2 * np.pi * self.frequencies * t + self.phases))
+    
+    def get_information_content(self) -> np.ndarray:
+        """Conteúdo informacional de cada oscilador"""
+        return np.log2(self.amplitudes + 1e-10)  # Evita log(0)
+    
+    def total_information(self) -> float:
+        """Conteúdo informacional total do banco"""
+        return float(np.sum(self.get_information_content()))
+    
+    def total_power(self, t: float = 0.0) -> float:
+        """
+        Soma de |valor|² de todos os osciladores.
+        
+        Como |A·exp(iθ)|² = A², o resultado não depende de t nem das fases.
+        """
+        return float(np.dot(self.amplitudes, self.amplitudes))
+
+
 class CoherenceFunction:
     """
     Função de coerência que determina a transição informação → realidade física.
@@ -131,35 +322,45 @@ class CoherenceFunction:
         Calcula a densidade informacional ⟨I(r,t)⟩ em uma posição e tempo.
         
         Args:
-            r: Posição
+            r: Posição (vetor 3D) ou array (..., 3) de posições
             t: Tempo  
-            oscillators: Lista de osciladores informacionais
+            oscillators: OscillatorBank ou lista de osciladores informacionais
         
         Returns:
-            Densidade informacional
+            Densidade informacional (escalar ou array com formato r.shape[:-1])
         """
+        # Peso espacial (decaimento com distância), comum a todos os osciladores
+        distance = np.linalg.norm(r, axis=-1)
+        spatial_weight = np.exp(-distance / self.params.planck_scale)
+        
         if oscillators is None:
             # Modelo simples: densidade baseada na distância
-            distance = np.linalg.norm(r)
-            return np.exp(-distance / self.params.planck_scale)
+            return spatial_weight
+        
+        return self.compute_oscillator_power(t, oscillators) * spatial_weight
+    
+    def compute_oscillator_power(self, t: float, oscillators: list) -> float:
+        """Soma das contribuições |valor|² de todos os osciladores no tempo t"""
+        if isinstance(oscillators, OscillatorBank):
+            return oscillators.total_power(t)
         
-        # Soma das contribuições de todos os osciladores
-        total_info = 0.0
+        total_power = 0.0
         for osc in oscillators:
             value = osc.get_value(t)
-            # Peso espacial (decaimento com distância)
-            spatial_weight = np.exp(-np.linalg.norm(r) / self.params.planck_scale)
-            total_info += abs(value)**2 * spatial_weight
-            
-        return total_info
+            total_power += abs(value)**2
+        return total_power
     
     def compute(self, r: np.ndarray, t: float, 
                oscillators: list = None) -> float:
         """
         Calcula a função de coerência Ω(r,t).
         
+        Args:
+            r: Posição (vetor 3D) ou array (..., 3) de posições
+        
         Returns:
-            Valor da função de coerência (real, entre 0 e 1)
+            Valor da função de coerência (real, entre 0 e 1), ou array com
+            formato r.shape[:-1]
         """
         info_density = self.compute_information_density(r, t, oscillators)
         coherence = np.tanh(info_density / self.params.I_c)
@@ -172,92 +373,276 @@ class NMSISimulator:
     Permite simulações de evolução temporal e análise de propriedades emergentes.
     """
     
-    def __init__(self, parameters: NMSIParameters):
+    def __init__(self, parameters: NMSIParameters,
+                 history: Optional[SimulationHistory] = None,
+                 coherence_estimator: Optional[CoherenceEstimator] = None):
+        """
+        Args:
+            parameters: Parâmetros fundamentais do NMSI
+            history: Armazenamento do histórico (padrão: colunas em RAM,
+                registrando todos os passos via observador 'history')
+            coherence_estimator: Estimador da coerência média (padrão: Monte
+                Carlo pseudoaleatório com Generator próprio)
+        """
         self.params = parameters
         self.field = SubquantumField(parameters)
-        self.oscillators = []
+        self.coherence_estimator = (
+            coherence_estimator if coherence_estimator is not None
+            else CoherenceEstimator(self.field.coherence_func)
+        )
+        self.oscillators = OscillatorBank()
         self.time = 0.0
-        self.history = []
+        self.step_count = 0
+        self.history = history if history is not None else SimulationHistory()
+        self.observers: Dict[str, SimulationObserver] = {}
+        self._phase_map_kernel = None
         
-    def add_oscillator(self, frequency: float, amplitude: float = 1.0):
-        """Adiciona um oscilador informacional ao sistema"""
-        osc = InformationalOscillator(frequency, amplitude)
-        self.oscillators.append(osc)
+        # Histórico padrão: total_information e avg_coherence a cada passo
+        self.add_observer('history', NMSISimulator._record_history, every=1)
+        
+    def add_oscillator(self, frequency: Union[float, np.ndarray],
+                       amplitude: Union[float, np.ndarray] = 1.0):
+        """
+        Adiciona osciladores informacionais ao sistema.
+        
+        Aceita escalares (um oscilador) ou arrays de frequências e amplitudes
+        para inserção em lote.
+        """
+        self.oscillators.add(frequency, amplitude)
         
+    def add_observer(self, name: str, callback: Callable[['NMSISimulator'], Any],
+                     every: Optional[int] = 1, at_end: bool = False) -> SimulationObserver:
+        """
+        Registra um observador chamado com o simulador como argumento.
+        
+        Args:
+            name: Nome único (substitui um observador existente de mesmo nome)
+            callback: Função callback(simulator)
+            every: Executa a cada `every` passos (None: só ao final/sob demanda)
+            at_end: Executa ao final de cada run_simulation
+        """
+        observer = SimulationObserver(name, callback, every, at_end)
+        self.observers[name] = observer
+        return observer
+    
+    def register_metric(self, name: str, metric: Callable[['NMSISimulator'], float],
+                        every: Optional[int] = 1, at_end: bool = False,
+                        history: Optional[SimulationHistory] = None) -> MetricObserver:
+        """
+        Registra uma métrica escalar, gravada em um histórico próprio com
+        colunas ('time', name) na cadência indicada.
+        """
+        observer = MetricObserver(name, metric, every, at_end, history)
+        self.observers[name] = observer
+        return observer
+    
+    def set_observer_cadence(self, name: str, every: Optional[int] = None,
+                             at_end: bool = False):
+        """Altera a cadência de um observador registrado"""
+        observer = self.observers[name]
+        if every is not None and every < 1:
+            raise ValueError("Observer cadence must be a positive number of steps")
+        observer.every = every
+        observer.at_end = at_end
+    
+    def remove_observer(self, name: str):
+        """Remove um observador registrado"""
+        del self.observers[name]
+    
+    def observe(self, name: str) -> Any:
+        """Executa um observador sob demanda, independentemente da cadência"""
+        return self.observers[name](self)
+    
+    def get_metric(self, name: str) -> SimulationHistory:
+        """Histórico de uma métrica registrada com register_metric"""
+        observer = self.observers[name]
+        if not isinstance(observer, MetricObserver):
+            raise ValueError(f"Observer '{name}' is not a metric")
+        return observer.history
+    
+    def _record_history(self):
+        """Observador padrão: salva o estado atual (respeitando a decimação)"""
+        if self.history.tick():
+            self.history.append(
+                time=self.time,
+                total_information=self.compute_total_information(),
+                avg_coherence=self.compute_average_coherence()
+            )
+    
+    def _advance(self, n_steps: int, dt: float):
+        """Evolui n_steps passos sem nenhuma medição"""
+        oscillators = self.oscillators
+        time = self.time
+        for _ in range(n_steps):
+            oscillators.evolve(dt)
+            time += dt
+        self.time = time
+        self.step_count += n_steps
+    
+    def _advance_analytic(self, n_steps: int, dt: float):
+        """Salta n_steps passos de uma vez, em O(osciladores)"""
+        self.oscillators.advance(n_steps * dt)
+        self.time += n_steps * dt
+        self.step_count += n_steps
+    
+    def _notify_due(self):
+        """Executa os observadores periódicos devidos no passo atual"""
+        for observer in list(self.observers.values()):
+            if observer.is_due(self.step_count):
+                observer(self)
+    
     def step(self, dt: float):
         """Executa um passo de simulação"""
-        # Evolui todos os osciladores
-        for osc in self.oscillators:
-            osc.evolve(dt)
-            
-        # Atualiza tempo
-        self.time += dt
-        
-        # Salva estado atual
-        self.history.append({
-            'time': self.time,
-            'total_information': self.compute_total_information(),
-            'avg_coherence': self.compute_average_coherence()
-        })
-        
-    def run_simulation(self, duration: float, dt: float = 0.01):
-        """Executa simulação por uma duração especificada"""
+        # Evolui todos os osciladores e atualiza o tempo
+        self._advance(1, dt)
+        
+        # Observadores devidos neste passo (por padrão, o histórico)
+        self._notify_due()
+        
+    def run_simulation(self, duration: float, dt: float = 0.01, mode: str = "step"):
+        """
+        Executa simulação por uma duração especificada.
+        
+        Entre os passos em que algum observador está agendado, a evolução
+        roda em laço fechado, sem medições; observadores com at_end rodam
+        uma vez ao final.
+        
+        Args:
+            duration: Duração da simulação
+            dt: Passo de tempo
+            mode: "step" evolui passo a passo; "analytic" salta diretamente
+                entre os passos em que há observadores agendados, com custo
+                O(osciladores) por salto em vez de O(passos × osciladores)
+        """
+        if mode == "step":
+            advance = self._advance
+        elif mode == "analytic":
+            advance = self._advance_analytic
+        else:
+            raise ValueError(f"Unknown simulation mode '{mode}', expected 'step' or 'analytic'")
+        
         steps = int(duration / dt)
+        end_step = self.step_count + steps
         
-        for _ in range(steps):
-            self.step(dt)
+        while self.step_count < end_step:
+            next_due = [observer.next_due(self.step_count)
+                        for observer in self.observers.values()]
+            target = min([s for s in next_due if s is not None] + [end_step])
+            
+            advance(target - self.step_count, dt)
+            self._notify_due()
+        
+        self._notify_at_end()
+    
+    def fast_forward(self, duration: float,
+                     sample_times: Optional[Sequence[float]] = None):
+        """
+        Avança o sistema analiticamente por `duration`, sem passos discretos.
+        
+        Os observadores periódicos rodam apenas nos instantes de sample_times
+        e os observadores com at_end rodam ao final. step_count não é alterado.
+        
+        Args:
+            duration: Intervalo de tempo a avançar
+            sample_times: Instantes, relativos ao tempo atual e em (0, duration],
+                nos quais as métricas são sintetizadas
+        """
+        sample_times = sorted(sample_times or [])
+        # Valida tudo antes de avançar, para não deixar o simulador pela metade
+        if sample_times and not (0.0 < sample_times[0] and sample_times[-1] <= duration):
+            raise ValueError("Sample times must lie in (0, duration]")
+        
+        elapsed = 0.0
+        for sample_time in sample_times:
+            self.oscillators.advance(sample_time - elapsed)
+            self.time += sample_time - elapsed
+            elapsed = sample_time
+            
+            for observer in list(self.observers.values()):
+                if observer.every is not None:
+                    observer(self)
+        
+        self.oscillators.advance(duration - elapsed)
+        self.time += duration - elapsed
+        self._notify_at_end()
+    
+    def _notify_at_end(self):
+        """Executa os observadores marcados com at_end"""
+        for observer in list(self.observers.values()):
+            if observer.at_end:
+                observer(self)
             
     def compute_total_information(self) -> float:
         """Calcula o conteúdo informacional total do sistema"""
-        total = 0.0
-        for osc in self.oscillators:
-            total += osc.get_information_content()
-        return total
-    
-    def compute_average_coherence(self, n_samples: int = 100) -> float:
-        """Calcula a coerência média em pontos aleatórios do espaço"""
-        coherence_sum = 0.0
-        
-        for _ in range(n_samples):
-            # Ponto aleatório no espaço
-            r = np.random.randn(3) * self.params.planck_scale
-            coherence = self.field.coherence_func.compute(r, self.time, self.oscillators)
-            coherence_sum += coherence
-            
-        return coherence_sum / n_samples
+        return self.oscillators.total_information()
+    
+    def compute_average_coherence(self, n_samples: int = 100,
+                                  target_se: Optional[float] = None) -> float:
+        """
+        Calcula a coerência média em pontos aleatórios do espaço.
+        
+        Args:
+            n_samples: Número de amostras (lote inicial se target_se for dado)
+            target_se: Erro padrão desejado em vez de um número fixo de amostras
+        """
+        return self.estimate_average_coherence(n_samples, target_se).mean
+    
+    def estimate_average_coherence(self, n_samples: int = 100,
+                                   target_se: Optional[float] = None) -> CoherenceEstimate:
+        """Como compute_average_coherence, mas retorna também o erro padrão"""
+        return self.coherence_estimator.estimate(
+            self.time, self.oscillators,
+            n_samples=n_samples, target_se=target_se
+        )
     
     def get_phase_difference_map(self, grid_size: int = 50) -> np.ndarray:
         """
         Calcula mapa de diferenças de fase para identificar domínios de matéria/energia escura.
         Δϕ ≈ π indica transição entre domínios.
         """
-        x = np.linspace(-10*self.params.planck_scale, 10*self.params.planck_scale, grid_size)
-        y = np.linspace(-10*self.params.planck_scale, 10*self.params.planck_scale, grid_size)
+        kernel = self._get_phase_map_kernel(grid_size)
+        return kernel.compute_phase(self.time)
+    
+    def _get_phase_map_kernel(self, grid_size: int) -> SpatialKernel:
+        """Retorna o kernel da grade do mapa de fase, reaproveitando o último criado"""
+        extent = 10 * self.params.planck_scale
+        cached = self._phase_map_kernel
+        if cached is not None and cached[0] == (grid_size, extent):
+            return cached[1]
         
-        phase_map = np.zeros((grid_size, grid_size))
+        x = np.linspace(-extent, extent, grid_size)
+        y = np.linspace(-extent, extent, grid_size)
         
-        for i in range(grid_size):
-            for j in range(grid_size):
-                r = np.array([x[i], y[j], 0.0])
-                field_value = self.field.compute_field(r, self.time)
-                phase_map[i, j] = np.angle(field_value)
-                
-        return phase_map
+        # phase_map[i, j] corresponde à posição (x[i], y[j], 0)
+        positions = np.zeros((grid_size, grid_size, 3))
+        positions[..., 0] = x[:, np.newaxis]
+        positions[..., 1] = y[np.newaxis, :]
+        
+        kernel = self.field.create_kernel(positions)
+        self._phase_map_kernel = ((grid_size, extent), kernel)
+        return kernel
     
-    def analyze_dark_matter_signature(self) -> dict:
+    def analyze_dark_matter_signature(self, grid_size: int = 50, tile_size: int = 512,
+                                      max_workers: Optional[int] = None) -> dict:
         """
         Analisa assinaturas de matéria escura baseada em diferenças de fase.
         Retorna estatísticas dos domínios encontrados.
+        
+        Mapas maiores que um bloco (ou com max_workers) são reduzidos bloco a
+        bloco pelo TiledPhaseMapEngine, sem materializar o mapa completo.
+        
+        Args:
+            grid_size: Resolução do mapa de fase (pontos por lado)
+            tile_size: Lado dos blocos usados em mapas grandes
+            max_workers: Número de threads para processar os blocos
         """
-        phase_map = self.get_phase_difference_map()
-        
-        # Identifica regiões com diferença de fase próxima a π
-        dark_matter_mask = np.abs(phase_map - np.pi) < 0.1
-        dark_energy_mask = np.abs(phase_map) < 0.1
-        
-        return {
-            'dark_matter_fraction': np.sum(dark_matter_mask) / phase_map.size,
-            'dark_energy_fraction': np.sum(dark_energy_mask) / phase_map.size,
-            'total_domains': np.sum(dark_matter_mask) + np.sum(dark_energy_mask),
-            'phase_variance': np.var(phase_map)
-        }
\ No newline at end of file
+        if grid_size <= tile_size and max_workers is None:
+            # Identifica regiões com diferença de fase próxima a π (matéria
+            # escura) ou a 0 (energia escura) no mapa em cache
+            phase_map = self.get_phase_difference_map(grid_size)
+            stats = PhaseStatistics.from_phases(phase_map)
+        else:
+            engine = TiledPhaseMapEngine(self.field, tile_size, max_workers)
+            stats = engine.analyze(self.time, grid_size, 10 * self.params.planck_scale)
+        
+        return stats.to_signature()
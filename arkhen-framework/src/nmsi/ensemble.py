@@ -0,0 +1,276 @@
+"""
+Execução de ensembles e varreduras de parâmetros NMSI
+
+Expande uma grade de parâmetros de NMSIParameters (omega, I_c, phi_0,
+k_vector, ...) combinada com configurações de osciladores e distribui as
+execuções num pool de processos. Cada worker grava suas métricas
+diretamente numa matriz de resultados compartilhada (memória compartilhada
+ou arquivo .npy mapeado em memória), sem devolver dicionários serializados.
+Com checkpoint_path, uma varredura interrompida é retomada a partir das
+linhas ainda não concluídas; uma impressão digital das execuções e da
+configuração, gravada ao lado do .npy, garante que o checkpoint é da mesma
+varredura.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from dataclasses import asdict, dataclass, replace
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .core import NMSIParameters, NMSISimulator
+from .sampling import CoherenceEstimator
+
+
+ENSEMBLE_METRICS = (
+    'total_information',
+    'final_coherence',
+    'dark_matter_fraction',
+    'dark_energy_fraction',
+    'total_domains',
+    'phase_variance',
+    'simulation_steps',
+)
+
+# Última coluna da matriz de resultados: 1.0 quando a linha foi concluída
+_DONE_COLUMN = len(ENSEMBLE_METRICS)
+
+
+@dataclass
+class EnsembleSettings:
+    """Configuração comum a todas as execuções do ensemble"""
+    duration: float = 10.0
+    dt: float = 0.01
+    mode: str = "step"
+    grid_size: int = 50
+    seed: Optional[int] = None
+
+
+@dataclass
+class EnsembleResult:
+    """Resultados de uma varredura, na ordem de EnsembleRunner.runs"""
+    parameters: List[Dict[str, Any]]
+    oscillator_index: List[int]
+    metrics: np.ndarray  # (n_runs, len(ENSEMBLE_METRICS))
+    completed: np.ndarray  # máscara booleana (n_runs,)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.metrics[:, ENSEMBLE_METRICS.index(name)]
+
+    def as_records(self) -> List[Dict[str, Any]]:
+        """Uma entrada por execução concluída, com parâmetros e métricas"""
+        records = []
+        for row in np.flatnonzero(self.completed):
+            record = dict(self.parameters[row])
+            record['oscillator_config'] = self.oscillator_index[row]
+            record.update(zip(ENSEMBLE_METRICS, self.metrics[row].tolist()))
+            records.append(record)
+        return records
+
+
+def _attach_results(handle: Tuple) -> Tuple[np.ndarray, Any]:
+    """Abre a matriz de resultados compartilhada descrita por handle"""
+    kind, location, shape = handle
+    if kind == 'memmap':
+        return np.load(location, mmap_mode='r+'), None
+
+    shm = shared_memory.SharedMemory(name=location)
+    return np.ndarray(shape, dtype=np.float64, buffer=shm.buf), shm
+
+
+def _run_member(handle: Tuple, row: int, parameters: NMSIParameters,
+                oscillators: Tuple[np.ndarray, np.ndarray],
+                settings: EnsembleSettings):
+    """Executa uma simulação do ensemble e grava a linha row dos resultados"""
+    seed = None if settings.seed is None else [settings.seed, row]
+    simulator = NMSISimulator(parameters)
+    simulator.coherence_estimator = CoherenceEstimator(simulator.field.coherence_func,
+                                                       seed=seed)
+    simulator.remove_observer('history')  # Apenas valores finais
+    simulator.add_oscillator(*oscillators)
+
+    simulator.run_simulation(settings.duration, settings.dt, mode=settings.mode)
+    signature = simulator.analyze_dark_matter_signature(settings.grid_size)
+
+    values = [
+        simulator.compute_total_information(),
+        simulator.compute_average_coherence(),
+        signature['dark_matter_fraction'],
+        signature['dark_energy_fraction'],
+        signature['total_domains'],
+        signature['phase_variance'],
+        simulator.step_count,
+    ]
+
+    results, shm = _attach_results(handle)
+    try:
+        results[row, :_DONE_COLUMN] = values
+        results[row, _DONE_COLUMN] = 1.0  # Marcado só depois das métricas
+        if isinstance(results, np.memmap):
+            results.flush()
+    finally:
+        del results
+        if shm is not None:
+            shm.close()
+
+
+class EnsembleRunner:
+    """
+    Varredura de parâmetros NMSI executada num pool de processos.
+
+    Cada execução é uma combinação (valores da grade de parâmetros,
+    configuração de osciladores); a ordem das execuções é a do produto
+    cartesiano, com as configurações de osciladores variando mais rápido.
+    """
+
+    def __init__(self, parameter_grid: Dict[str, Sequence],
+                 oscillator_configs: Sequence[Tuple[Any, Any]] = ((1.0, 1.0),),
+                 base_parameters: Optional[NMSIParameters] = None,
+                 settings: Optional[EnsembleSettings] = None):
+        """
+        Args:
+            parameter_grid: {campo de NMSIParameters: valores a varrer}
+            oscillator_configs: Sequência de (frequências, amplitudes), escalares
+                ou arrays, passadas a NMSISimulator.add_oscillator
+            base_parameters: Valores dos campos fora da grade
+            settings: Duração, passo, modo, resolução do mapa e semente
+        """
+        unknown = set(parameter_grid) - set(NMSIParameters.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown NMSI parameters in grid: {sorted(unknown)}")
+
+        self.parameter_grid = dict(parameter_grid)
+        self.oscillator_configs = [
+            (np.atleast_1d(np.asarray(f, dtype=float)), np.asarray(a, dtype=float))
+            for f, a in oscillator_configs
+        ]
+        self.base_parameters = base_parameters or NMSIParameters()
+        self.settings = settings or EnsembleSettings()
+
+        names = list(self.parameter_grid)
+        self.runs: List[Tuple[Dict[str, Any], int]] = [
+            (dict(zip(names, values)), osc_index)
+            for values in itertools.product(*self.parameter_grid.values())
+            for osc_index in range(len(self.oscillator_configs))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def _parameters_for(self, overrides: Dict[str, Any]) -> NMSIParameters:
+        overrides = {name: (np.asarray(value, dtype=float) if name == 'k_vector' else value)
+                     for name, value in overrides.items()}
+        return replace(self.base_parameters, **overrides)
+
+    def run(self, max_workers: Optional[int] = None,
+            checkpoint_path: Optional[str] = None,
+            executor: Optional[Executor] = None) -> EnsembleResult:
+        """
+        Executa as simulações pendentes da varredura.
+
+        Args:
+            max_workers: Processos do pool (padrão: número de CPUs)
+            checkpoint_path: Arquivo .npy com a matriz de resultados; se já
+                existir com o mesmo formato, as linhas concluídas são puladas
+            executor: Executor externo em vez de um ProcessPoolExecutor próprio
+
+        Returns:
+            EnsembleResult com as métricas de todas as linhas concluídas
+        """
+        shape = (len(self.runs), len(ENSEMBLE_METRICS) + 1)
+        shm = None
+
+        if checkpoint_path is not None:
+            results = self._open_checkpoint(checkpoint_path, shape, self.fingerprint())
+            handle = ('memmap', checkpoint_path, shape)
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+            results = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+            results[:] = 0.0
+            handle = ('shm', shm.name, shape)
+
+        try:
+            pending = np.flatnonzero(results[:, _DONE_COLUMN] != 1.0)
+            own_executor = executor is None
+            if own_executor:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+            try:
+                futures = [
+                    executor.submit(_run_member, handle, int(row),
+                                    self._parameters_for(self.runs[row][0]),
+                                    self.oscillator_configs[self.runs[row][1]],
+                                    self.settings)
+                    for row in pending
+                ]
+                done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in not_done:
+                    future.cancel()
+                for future in done:
+                    future.result()  # Propaga a primeira falha
+            finally:
+                if own_executor:
+                    executor.shutdown()
+
+            return EnsembleResult(
+                parameters=[overrides for overrides, _ in self.runs],
+                oscillator_index=[osc_index for _, osc_index in self.runs],
+                metrics=np.array(results[:, :_DONE_COLUMN]),
+                completed=np.array(results[:, _DONE_COLUMN] == 1.0)
+            )
+        finally:
+            if shm is not None:
+                del results
+                shm.close()
+                shm.unlink()
+
+    def fingerprint(self) -> str:
+        """
+        SHA-256 das execuções (parâmetros completos e osciladores de cada
+        linha), das configurações e das métricas da varredura
+        """
+        def encode(value):
+            return value.tolist() if hasattr(value, 'tolist') else str(value)
+        
+        description = {
+            'metrics': ENSEMBLE_METRICS,
+            'settings': asdict(self.settings),
+            'oscillator_configs': [(f, a) for f, a in self.oscillator_configs],
+            'runs': [(asdict(self._parameters_for(overrides)), osc_index)
+                     for overrides, osc_index in self.runs],
+        }
+        payload = json.dumps(description, default=encode, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    @staticmethod
+    def _open_checkpoint(path: str, shape: Tuple[int, int], fingerprint: str) -> np.memmap:
+        """
+        Abre (para retomar) ou cria o arquivo de resultados.
+        
+        A impressão digital da varredura fica em `path + '.fingerprint'`; um
+        checkpoint sem ela, ou de outra varredura, é recusado.
+        """
+        fingerprint_path = path + '.fingerprint'
+        if os.path.exists(path):
+            stored = None
+            if os.path.exists(fingerprint_path):
+                with open(fingerprint_path) as f:
+                    stored = f.read().strip()
+            if stored != fingerprint:
+                raise ValueError(f"Checkpoint {path} belongs to a different sweep "
+                                 f"(fingerprint mismatch or missing {fingerprint_path})")
+            
+            results = np.load(path, mmap_mode='r+')
+            if results.shape != shape:
+                raise ValueError(f"Checkpoint {path} has shape {results.shape}, "
+                                 f"expected {shape} for this sweep")
+            return results
+        
+        results = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=shape)
+        results.flush()
+        with open(fingerprint_path, 'w') as f:
+            f.write(fingerprint + '\n')
+        return results
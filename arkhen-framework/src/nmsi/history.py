@@ -0,0 +1,204 @@
+"""
+Armazenamento colunar do histórico de simulações NMSI
+
+Substitui a lista de dicionários por colunas NumPy pré-alocadas, com:
+- decimação (registra um a cada `stride` passos)
+- buffer circular de capacidade fixa (mantém só os registros mais recentes)
+- descarga para arquivo mapeado em memória em execuções maiores que a RAM
+"""
+
+import os
+import numpy as np
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+
+HISTORY_FIELDS = ('time', 'total_information', 'avg_coherence')
+
+
+class SimulationHistory:
+    """
+    Histórico colunar e limitado de uma simulação.
+
+    Cada campo é uma coluna float64 contígua. No modo padrão as colunas
+    crescem geometricamente; com ring=True apenas os últimos `capacity`
+    registros são mantidos; com spill_path os blocos cheios são anexados ao
+    arquivo e relidos via np.memmap, mantendo em RAM no máximo `capacity`
+    registros.
+
+    Continua indexável como a antiga lista: len(history), history[-1]['time']
+    e iteração sobre dicionários funcionam.
+    """
+
+    def __init__(self, capacity: int = 1024, stride: int = 1, ring: bool = False,
+                 spill_path: Optional[str] = None,
+                 fields: Sequence[str] = HISTORY_FIELDS,
+                 overwrite: bool = False):
+        """
+        Args:
+            capacity: Registros mantidos em memória (capacidade inicial no modo padrão)
+            stride: Registra um a cada `stride` passos (ver tick)
+            ring: Se True, descarta os registros mais antigos ao encher
+            spill_path: Arquivo para onde blocos cheios são descarregados
+            fields: Nomes das colunas
+            overwrite: Permite truncar um arquivo já existente em spill_path
+        """
+        if capacity < 1:
+            raise ValueError("History capacity must be positive")
+        if stride < 1:
+            raise ValueError("History stride must be positive")
+        if ring and spill_path is not None:
+            raise ValueError("Ring buffer and spill-to-disk are mutually exclusive")
+        if spill_path is not None and os.path.exists(spill_path) and not overwrite:
+            raise FileExistsError(f"Spill file {spill_path} already exists; "
+                                  f"pass overwrite=True to truncate it")
+
+        self.capacity = int(capacity)
+        self.stride = int(stride)
+        self.ring = ring
+        self.spill_path = spill_path
+        self.fields = tuple(fields)
+        self.row_dtype = np.dtype([(name, np.float64) for name in self.fields])
+
+        self._columns = {name: np.empty(self.capacity) for name in self.fields}
+        self.clear()
+
+    def clear(self):
+        """
+        Remove todos os registros (e trunca o arquivo de descarga, que a esta
+        altura pertence a este histórico)
+        """
+        self._size = 0       # registros em RAM
+        self._head = 0       # próxima posição de escrita no modo circular
+        self._spilled = 0    # registros já gravados em disco
+        self._ticks = 0
+        self.total_recorded = 0
+
+        if self.spill_path is not None:
+            open(self.spill_path, 'wb').close()
+
+    def tick(self) -> bool:
+        """Conta um passo de simulação e indica se ele deve ser registrado"""
+        due = self._ticks % self.stride == 0
+        self._ticks += 1
+        return due
+
+    def append(self, **values: float):
+        """Adiciona um registro; todos os campos devem ser fornecidos"""
+        if self._size == self.capacity and not self.ring:
+            if self.spill_path is not None:
+                self._spill()
+            else:
+                self._grow()
+
+        index = self._head if self.ring else self._size
+        for name in self.fields:
+            self._columns[name][index] = values[name]
+
+        if self.ring:
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+        else:
+            self._size += 1
+        self.total_recorded += 1
+
+    def _grow(self):
+        """Dobra a capacidade das colunas em RAM"""
+        for name in self.fields:
+            grown = np.empty(2 * len(self._columns[name]))
+            grown[:self._size] = self._columns[name][:self._size]
+            self._columns[name] = grown
+        self.capacity *= 2
+
+    def _spill(self):
+        """Anexa os registros em RAM ao arquivo de descarga e esvazia o buffer"""
+        rows = np.empty(self._size, dtype=self.row_dtype)
+        for name in self.fields:
+            rows[name] = self._columns[name][:self._size]
+
+        with open(self.spill_path, 'ab') as f:
+            f.write(rows.tobytes())
+
+        self._spilled += self._size
+        self._size = 0
+
+    def _memory_column(self, name: str) -> np.ndarray:
+        """Coluna em RAM em ordem cronológica"""
+        column = self._columns[name]
+        if self.ring and self._size == self.capacity:
+            return np.concatenate([column[self._head:], column[:self._head]])
+        return column[:self._size]
+
+    def _spilled_rows(self) -> Optional[np.memmap]:
+        if not self._spilled:
+            return None
+        return np.memmap(self.spill_path, dtype=self.row_dtype, mode='r',
+                         shape=(self._spilled,))
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Retorna a coluna completa em ordem cronológica.
+        
+        Sem descarga, é uma cópia da coluna em RAM. Com descarga, os registros
+        ainda em RAM são gravados no arquivo e o resultado é uma visão
+        np.memmap (somente leitura) da coluna inteira, sem carregá-la na RAM.
+        """
+        if name not in self._columns:
+            raise KeyError(f"Unknown history field: {name}")
+        
+        if not self._spilled:
+            return self._memory_column(name).copy()
+        if self._size:
+            self._spill()
+        return self._spilled_rows()[name]
+    
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        """Retorna todas as colunas como {campo: array} (ver column)"""
+        return {name: self.column(name) for name in self.fields}
+    
+    def iter_chunks(self, chunk_size: int = 65536) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Percorre o histórico em blocos {campo: array} de até chunk_size
+        registros, lendo o arquivo de descarga aos poucos.
+        """
+        spilled = self._spilled_rows()
+        if spilled is not None:
+            for start in range(0, len(spilled), chunk_size):
+                rows = np.array(spilled[start:start + chunk_size])
+                yield {name: rows[name] for name in self.fields}
+        
+        if self._size:
+            tail = {name: self._memory_column(name) for name in self.fields}
+            for start in range(0, self._size, chunk_size):
+                yield {name: column[start:start + chunk_size] for name, column in tail.items()}
+    
+    def __len__(self) -> int:
+        return self._spilled + self._size
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        n = len(self)
+        if not -n <= index < n:
+            raise IndexError("history index out of range")
+        index %= n
+
+        if index < self._spilled:
+            row = self._spilled_rows()[index]
+            return {name: float(row[name]) for name in self.fields}
+
+        index -= self._spilled
+        if self.ring and self._size == self.capacity:
+            index = (self._head + index) % self.capacity
+        return {name: float(self._columns[name][index]) for name in self.fields}
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for chunk in self.iter_chunks():
+            columns = {name: chunk[name].tolist() for name in self.fields}
+            for i in range(len(columns[self.fields[0]])):
+                yield {name: columns[name][i] for name in self.fields}
+
+    def __repr__(self) -> str:
+        mode = 'ring' if self.ring else ('spill' if self.spill_path else 'grow')
+        return (f"SimulationHistory(records={len(self)}, mode={mode}, "
+                f"capacity={self.capacity}, stride={self.stride})")
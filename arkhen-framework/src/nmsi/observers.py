@@ -0,0 +1,66 @@
+"""
+Observadores de simulação NMSI com cadência configurável
+
+Um observador é uma função chamada pelo NMSISimulator a cada `every` passos,
+apenas ao final de run_simulation (at_end) ou sob demanda. Assim a evolução
+dos osciladores roda sem nenhuma medição nos passos em que nenhum observador
+está agendado.
+"""
+
+from typing import Any, Callable, Optional
+
+from .history import SimulationHistory
+
+
+class SimulationObserver:
+    """Função executada sobre o simulador numa cadência configurável"""
+
+    def __init__(self, name: str, callback: Callable[[Any], Any],
+                 every: Optional[int] = 1, at_end: bool = False):
+        """
+        Args:
+            name: Nome único do observador
+            callback: Função chamada com o simulador como argumento
+            every: Executa a cada `every` passos (None: nunca periodicamente)
+            at_end: Executa ao final de cada run_simulation
+        """
+        if every is not None and every < 1:
+            raise ValueError("Observer cadence must be a positive number of steps")
+        self.name = name
+        self.callback = callback
+        self.every = every
+        self.at_end = at_end
+
+    def is_due(self, step_count: int) -> bool:
+        """Indica se o observador deve rodar após o passo step_count"""
+        return self.every is not None and step_count % self.every == 0
+
+    def next_due(self, step_count: int) -> Optional[int]:
+        """Próximo passo (> step_count) em que o observador deve rodar"""
+        if self.every is None:
+            return None
+        return (step_count // self.every + 1) * self.every
+
+    def __call__(self, simulator) -> Any:
+        return self.callback(simulator)
+
+    def __repr__(self) -> str:
+        return f"SimulationObserver({self.name!r}, every={self.every}, at_end={self.at_end})"
+
+
+class MetricObserver(SimulationObserver):
+    """Observador que registra o valor de uma métrica escalar num histórico próprio"""
+
+    def __init__(self, name: str, metric: Callable[[Any], float],
+                 every: Optional[int] = 1, at_end: bool = False,
+                 history: Optional[SimulationHistory] = None):
+        super().__init__(name, self._record, every, at_end)
+        self.metric = metric
+        self.history = history if history is not None else SimulationHistory(fields=('time', name))
+        if name not in self.history.fields:
+            raise ValueError(f"Metric history must have a '{name}' field")
+
+    def _record(self, simulator) -> float:
+        value = self.metric(simulator)
+        self.history.append(time=simulator.time, **{self.name: value})
+        return value
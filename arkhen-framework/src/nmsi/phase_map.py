@@ -0,0 +1,171 @@
+"""
+Mapa de fase em blocos para análise de matéria/energia escura
+
+Avalia o mapa de fase arg Ψ(r,t) bloco a bloco e reduz as frações de
+domínios e a variância da fase com acumuladores de fluxo (Welford, com a
+fusão de Chan para combinar blocos), de modo que o mapa completo nunca é
+materializado. Os blocos podem ser processados num pool de workers.
+"""
+
+import numpy as np
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .core import SubquantumField
+
+
+# Tolerância em torno de π (matéria escura) e de 0 (energia escura)
+DOMAIN_TOLERANCE = 0.1
+
+
+@dataclass
+class PhaseStatistics:
+    """Estatísticas acumuladas de um mapa de fase (ou de parte dele)"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Soma dos quadrados dos desvios em relação à média
+    dark_matter: int = 0
+    dark_energy: int = 0
+
+    @classmethod
+    def from_phases(cls, phases: np.ndarray,
+                    tolerance: float = DOMAIN_TOLERANCE) -> 'PhaseStatistics':
+        """Calcula as estatísticas de um bloco de fases"""
+        count = phases.size
+        if count == 0:
+            return cls()
+        mean = float(np.mean(phases))
+        return cls(
+            count=count,
+            mean=mean,
+            m2=float(np.sum((phases - mean) ** 2)),
+            dark_matter=int(np.count_nonzero(np.abs(phases - np.pi) < tolerance)),
+            dark_energy=int(np.count_nonzero(np.abs(phases) < tolerance))
+        )
+
+    def merge(self, other: 'PhaseStatistics') -> 'PhaseStatistics':
+        """Combina duas estatísticas parciais (fusão paralela de Welford)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            return other
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return PhaseStatistics(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta ** 2 * self.count * other.count / count,
+            dark_matter=self.dark_matter + other.dark_matter,
+            dark_energy=self.dark_energy + other.dark_energy
+        )
+
+    @property
+    def variance(self) -> float:
+        """Variância populacional da fase (equivalente a np.var)"""
+        return self.m2 / self.count if self.count else 0.0
+
+    def to_signature(self) -> dict:
+        """Formato retornado por NMSISimulator.analyze_dark_matter_signature"""
+        return {
+            'dark_matter_fraction': self.dark_matter / self.count,
+            'dark_energy_fraction': self.dark_energy / self.count,
+            'total_domains': self.dark_matter + self.dark_energy,
+            'phase_variance': self.variance
+        }
+
+
+def _tile_statistics(field: 'SubquantumField', t: float,
+                     x: np.ndarray, y: np.ndarray) -> PhaseStatistics:
+    """Estatísticas do bloco de posições (x[i], y[j], 0) no tempo t"""
+    positions = np.zeros((len(x), len(y), 3))
+    positions[..., 0] = x[:, np.newaxis]
+    positions[..., 1] = y[np.newaxis, :]
+
+    phases = field.create_kernel(positions).compute_phase(t)
+    return PhaseStatistics.from_phases(phases)
+
+
+class TiledPhaseMapEngine:
+    """
+    Motor que percorre um mapa de fase grid_size × grid_size em blocos.
+
+    A memória usada é proporcional a tile_size² por worker,
+    independentemente da resolução total.
+    """
+
+    def __init__(self, field: 'SubquantumField', tile_size: int = 512,
+                 max_workers: Optional[int] = None,
+                 executor: Optional[Executor] = None):
+        """
+        Args:
+            field: Campo subquântico a ser mapeado
+            tile_size: Lado de cada bloco, em pontos
+            max_workers: Se fornecido (e executor for None), processa os
+                blocos num ThreadPoolExecutor com esse número de threads
+            executor: Executor externo (ex.: ProcessPoolExecutor) para os blocos
+        """
+        if tile_size < 1:
+            raise ValueError("Tile size must be positive")
+        self.field = field
+        self.tile_size = tile_size
+        self.max_workers = max_workers
+        self.executor = executor
+
+    def iter_tiles(self, grid_size: int) -> Iterator[Tuple[slice, slice]]:
+        """Gera os pares de fatias (linhas, colunas) de cada bloco"""
+        for i0 in range(0, grid_size, self.tile_size):
+            for j0 in range(0, grid_size, self.tile_size):
+                yield (slice(i0, min(i0 + self.tile_size, grid_size)),
+                       slice(j0, min(j0 + self.tile_size, grid_size)))
+
+    def analyze(self, t: float, grid_size: int, extent: float) -> PhaseStatistics:
+        """
+        Reduz o mapa de fase no quadrado [-extent, extent]² ao tempo t.
+
+        Args:
+            t: Tempo
+            grid_size: Resolução do mapa (pontos por lado)
+            extent: Meia largura do domínio
+
+        Returns:
+            Estatísticas agregadas de todos os blocos
+        """
+        x = np.linspace(-extent, extent, grid_size)
+        y = np.linspace(-extent, extent, grid_size)
+        tiles = ((x[rows], y[cols]) for rows, cols in self.iter_tiles(grid_size))
+
+        executor = self.executor
+        if executor is None and self.max_workers is None:
+            stats = PhaseStatistics()
+            for x_tile, y_tile in tiles:
+                stats = stats.merge(_tile_statistics(self.field, t, x_tile, y_tile))
+            return stats
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            return self._analyze_parallel(executor, tiles, t)
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    def _analyze_parallel(self, executor: Executor, tiles, t: float) -> PhaseStatistics:
+        """Submete os blocos mantendo um número limitado de tarefas pendentes"""
+        max_pending = 2 * (self.max_workers or getattr(executor, '_max_workers', 4))
+        stats = PhaseStatistics()
+        pending = set()
+
+        for x_tile, y_tile in tiles:
+            pending.add(executor.submit(_tile_statistics, self.field, t, x_tile, y_tile))
+            if len(pending) >= max_pending:
+                done = next(as_completed(pending))
+                pending.remove(done)
+                stats = stats.merge(done.result())
+
+        for future in as_completed(pending):
+            stats = stats.merge(future.result())
+        return stats
@@ -0,0 +1,152 @@
+"""
+Estimadores Monte Carlo da coerência média do campo NMSI
+
+Estima ⟨Ω(r,t)⟩ com r ~ N(0, planck_scale²·I₃) avaliando todas as amostras
+em lote, a partir de um np.random.Generator dedicado (reprodutível via seed).
+Oferece amostragem pseudoaleatória ou quasi-aleatória (Sobol/Halton
+embaralhadas), erro padrão da estimativa e modo de precisão alvo.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Union
+from scipy.stats import norm, qmc
+
+
+SAMPLING_METHODS = ('random', 'sobol', 'halton')
+
+
+@dataclass
+class CoherenceEstimate:
+    """Resultado de uma estimativa de coerência média"""
+    mean: float
+    std_error: float
+    n_samples: int
+
+    def __float__(self) -> float:
+        return self.mean
+
+
+class CoherenceEstimator:
+    """
+    Estimador vetorizado da coerência média em pontos aleatórios do espaço.
+
+    No modo 'random' o erro padrão é o desvio amostral / √n. Nos modos
+    quasi-aleatórios ('sobol', 'halton') as amostras são divididas em
+    `n_replicates` sequências embaralhadas independentes e o erro padrão é
+    obtido da dispersão entre as médias das réplicas (QMC randomizado).
+    """
+
+    def __init__(self, coherence_func, method: str = 'random',
+                 seed: Optional[Union[int, np.random.Generator]] = None,
+                 n_replicates: int = 8):
+        """
+        Args:
+            coherence_func: CoherenceFunction a ser amostrada
+            method: 'random', 'sobol' ou 'halton'
+            seed: Semente ou Generator usado em todas as amostragens
+            n_replicates: Número de réplicas embaralhadas nos modos QMC
+        """
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method '{method}', "
+                             f"expected one of {SAMPLING_METHODS}")
+        if method != 'random' and n_replicates < 2:
+            raise ValueError("Quasi-random sampling needs at least 2 replicates")
+
+        self.coherence_func = coherence_func
+        self.method = method
+        self.rng = np.random.default_rng(seed)
+        self.n_replicates = n_replicates
+
+    def estimate(self, t: float, oscillators=None, n_samples: int = 100,
+                 target_se: Optional[float] = None,
+                 max_samples: int = 2**20) -> CoherenceEstimate:
+        """
+        Estima a coerência média no tempo t.
+
+        Args:
+            t: Tempo
+            oscillators: OscillatorBank ou lista de osciladores
+            n_samples: Amostras do primeiro lote
+            target_se: Erro padrão desejado; se fornecido, o número de amostras
+                é dobrado até atingi-lo ou até max_samples
+            max_samples: Limite de amostras no modo de precisão alvo
+
+        Returns:
+            CoherenceEstimate com média, erro padrão e amostras usadas
+        """
+        if n_samples < 2:
+            raise ValueError("At least 2 samples are required for an error estimate")
+
+        if self.method == 'random':
+            sampler = _RandomSampler(self.rng)
+        else:
+            sampler = _ScrambledSampler(self.method, self.rng, self.n_replicates)
+
+        batch = n_samples
+        while True:
+            for replicate, points in sampler.draw(batch):
+                positions = points * self.coherence_func.params.planck_scale
+                values = self.coherence_func.compute(positions, t, oscillators)
+                sampler.accumulate(replicate, values)
+
+            result = sampler.result()
+            if (target_se is None or result.std_error <= target_se
+                    or result.n_samples >= max_samples):
+                return result
+            batch = min(result.n_samples, max_samples - result.n_samples)
+
+
+class _RandomSampler:
+    """Amostras N(0, I₃) pseudoaleatórias com somas acumuladas"""
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def draw(self, n: int):
+        yield 0, self.rng.standard_normal((n, 3))
+
+    def accumulate(self, replicate: int, values: np.ndarray):
+        self.count += len(values)
+        self.total += float(np.sum(values))
+        self.total_sq += float(np.dot(values, values))
+
+    def result(self) -> CoherenceEstimate:
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean**2, 0.0) * self.count / (self.count - 1)
+        return CoherenceEstimate(mean, float(np.sqrt(variance / self.count)), self.count)
+
+
+class _ScrambledSampler:
+    """Réplicas independentes de sequências Sobol/Halton embaralhadas"""
+
+    def __init__(self, method: str, rng: np.random.Generator, n_replicates: int):
+        engine_cls = qmc.Sobol if method == 'sobol' else qmc.Halton
+        self.method = method
+        self.engines = [engine_cls(d=3, scramble=True, seed=rng)
+                        for _ in range(n_replicates)]
+        self.counts = np.zeros(n_replicates, dtype=np.int64)
+        self.totals = np.zeros(n_replicates)
+
+    def draw(self, n: int):
+        per_replicate = -(-n // len(self.engines))
+        if self.method == 'sobol':
+            # Sobol só é balanceada em blocos de 2^m pontos
+            per_replicate = 1 << int(np.ceil(np.log2(per_replicate)))
+
+        for replicate, engine in enumerate(self.engines):
+            uniform = engine.random(per_replicate)
+            eps = np.finfo(float).eps
+            yield replicate, norm.ppf(np.clip(uniform, eps, 1 - eps))
+
+    def accumulate(self, replicate: int, values: np.ndarray):
+        self.counts[replicate] += len(values)
+        self.totals[replicate] += float(np.sum(values))
+
+    def result(self) -> CoherenceEstimate:
+        means = self.totals / self.counts
+        std_error = float(np.std(means, ddof=1) / np.sqrt(len(means)))
+        return CoherenceEstimate(float(np.mean(means)), std_error, int(self.counts.sum()))
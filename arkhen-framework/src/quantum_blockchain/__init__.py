@@ -17,9 +17,18 @@ from .core import (
 
 from .consensus import (
     PoQCConsensus,
+    QuantumProof,
+    ConsensusRoundContext,
+    IncrementalCoherence,
+    ValidatorRegistry,
+    ProofReplayCache,
     compute_coherence_parameter,
+    coherence_from_expectations,
+    batch_pauli_expectations,
     compute_fraud_probability,
-    validate_quantum_proof
+    validate_quantum_proof,
+    pack_proofs,
+    unpack_proofs
 )
 
 from .interfaces import (
@@ -41,9 +50,18 @@ __all__ = [
     "QuantumNode",
     "QuantumConsensus",
     "PoQCConsensus",
+    "QuantumProof",
+    "ConsensusRoundContext",
+    "IncrementalCoherence",
+    "ValidatorRegistry",
+    "ProofReplayCache",
     "compute_coherence_parameter",
+    "coherence_from_expectations",
+    "batch_pauli_expectations",
     "compute_fraud_probability",
     "validate_quantum_proof",
+    "pack_proofs",
+    "unpack_proofs",
     "DimensionalInterface",
     "QuantumSingularity",
     "InterdimensionalBridge",
@@ -7,14 +7,45 @@ P_fraud = 1 - e^(-λΔC)
 """
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Sequence, Tuple, Optional, Union
+from collections.abc import Mapping
 from dataclasses import dataclass
 import hashlib
+import heapq
+import math
+import struct
+import threading
 import time
+from functools import lru_cache
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
 from qiskit.quantum_info import random_statevector, Statevector
 from qiskit.quantum_info.operators import Pauli
 import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# Formato binário das provas (little-endian). Cabeçalho fixo:
+# magia, versão, código do dtype do estado, reservado, timestamp, coerência,
+# assinatura (SHA-256 bruto), tamanhos do node_id, do estado, das medidas de
+# Pauli e do bloco de chaves. Seguem, cada seção alinhada a 16 bytes: node_id
+# (UTF-8), amplitudes do estado, valores das medidas (float64) e chaves das
+# medidas (UTF-8 separadas por \0).
+_PROOF_MAGIC = b'PoQC'
+_PROOF_FORMAT_VERSION = 1
+_PROOF_HEADER = struct.Struct('<4sBBHdd32sIIII')
+_PROOF_HEADER_SIGNATURE_SIZE = 32
+_BATCH_MAGIC = b'PoQB'
+_BATCH_HEADER = struct.Struct('<4sI8x')
+_STATE_DTYPES = {0: np.dtype('<c8'), 1: np.dtype('<c16')}
+_STATE_DTYPE_CODES = {dtype: code for code, dtype in _STATE_DTYPES.items()}
+_ALIGNMENT = 16
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGNMENT
 
 
 @dataclass
@@ -36,90 +67,574 @@ class QuantumProof:
             'coherence_value': self.coherence_value,
             'signature': self.signature
         }
+    
+    def to_bytes(self, dtype: Optional[np.dtype] = None) -> bytes:
+        """
+        Serializa a prova no formato binário compacto.
+        
+        Args:
+            dtype: complex64 ou complex128 para as amplitudes (padrão: o do
+                estado, se for um deles, senão complex128)
+        
+        Returns:
+            Registro com tamanho múltiplo de 16 bytes
+        
+        Raises:
+            ValueError: Se a assinatura não for um SHA-256 em hexadecimal
+                (32 bytes) ou o dtype não for suportado
+        """
+        try:
+            signature = bytes.fromhex(self.signature)
+        except ValueError:
+            signature = b''
+        if len(signature) != _PROOF_HEADER_SIGNATURE_SIZE:
+            raise ValueError(f"Proof signature must be {_PROOF_HEADER_SIGNATURE_SIZE} bytes "
+                             f"of hex (SHA-256), got {self.signature!r}")
+        
+        state = np.asarray(self.quantum_state)
+        if dtype is None:
+            dtype = state.dtype if state.dtype in (np.complex64, np.complex128) else np.complex128
+        dtype = np.dtype(dtype).newbyteorder('<')
+        if dtype not in _STATE_DTYPE_CODES:
+            raise ValueError(f"Unsupported state dtype {dtype}, expected complex64 or complex128")
+        
+        node_id = self.node_id.encode('utf-8')
+        keys = '\0'.join(self.pauli_measurements).encode('utf-8')
+        values = np.fromiter(self.pauli_measurements.values(), dtype='<f8',
+                             count=len(self.pauli_measurements))
+        
+        header = _PROOF_HEADER.pack(
+            _PROOF_MAGIC, _PROOF_FORMAT_VERSION, _STATE_DTYPE_CODES[dtype], 0,
+            self.timestamp, self.coherence_value, signature,
+            len(node_id), state.size, len(values), len(keys)
+        )
+        sections = [header, node_id, state.astype(dtype, copy=False).tobytes(),
+                    values.tobytes(), keys]
+        
+        parts = []
+        for section in sections:
+            parts.append(section)
+            parts.append(bytes(_padding(len(section))))
+        return b''.join(parts)
+    
+    @classmethod
+    def from_bytes(cls, data: BytesLike) -> 'QuantumProof':
+        """
+        Reconstrói uma prova serializada por to_bytes.
+        
+        O estado é uma visão somente leitura de `data` (np.frombuffer), sem
+        cópia das amplitudes.
+        """
+        proof, _ = cls._decode(memoryview(data), 0)
+        return proof
+    
+    @classmethod
+    def _decode(cls, buffer: memoryview, offset: int) -> Tuple['QuantumProof', int]:
+        """Decodifica o registro em offset; retorna a prova e o fim do registro"""
+        (magic, version, dtype_code, _, timestamp, coherence_value, digest,
+         node_id_len, n_amplitudes, n_measurements, keys_len) = _PROOF_HEADER.unpack_from(buffer, offset)
+        if magic != _PROOF_MAGIC:
+            raise ValueError("Not a serialized quantum proof")
+        if version != _PROOF_FORMAT_VERSION:
+            raise ValueError(f"Unsupported proof format version {version}")
+        if dtype_code not in _STATE_DTYPES:
+            raise ValueError(f"Unknown state dtype code {dtype_code}")
+        dtype = _STATE_DTYPES[dtype_code]
+        
+        offset += _PROOF_HEADER.size + _padding(_PROOF_HEADER.size)
+        node_id = bytes(buffer[offset:offset + node_id_len]).decode('utf-8')
+        offset += node_id_len + _padding(node_id_len)
+        
+        quantum_state = np.frombuffer(buffer, dtype=dtype, count=n_amplitudes, offset=offset)
+        offset += quantum_state.nbytes + _padding(quantum_state.nbytes)
+        
+        values = np.frombuffer(buffer, dtype='<f8', count=n_measurements, offset=offset)
+        offset += values.nbytes + _padding(values.nbytes)
+        
+        keys = bytes(buffer[offset:offset + keys_len]).decode('utf-8')
+        offset += keys_len + _padding(keys_len)
+        keys = keys.split('\0') if n_measurements else []
+        if len(keys) != n_measurements:
+            raise ValueError("Corrupted Pauli measurement section")
+        
+        proof = cls(
+            node_id=node_id,
+            timestamp=timestamp,
+            quantum_state=quantum_state,
+            pauli_measurements=dict(zip(keys, values.tolist())),
+            coherence_value=coherence_value,
+            signature=digest.hex()
+        )
+        return proof, offset
+
+
+def pack_proofs(proofs: Sequence[QuantumProof], dtype: Optional[np.dtype] = None) -> bytes:
+    """Serializa várias provas num único buffer (cabeçalho de lote + registros)"""
+    parts = [_BATCH_HEADER.pack(_BATCH_MAGIC, len(proofs))]
+    parts.extend(proof.to_bytes(dtype) for proof in proofs)
+    return b''.join(parts)
+
+
+def unpack_proofs(data: BytesLike) -> List[QuantumProof]:
+    """Reconstrói as provas de um buffer criado por pack_proofs (estados sem cópia)"""
+    buffer = memoryview(data)
+    magic, count = _BATCH_HEADER.unpack_from(buffer, 0)
+    if magic != _BATCH_MAGIC:
+        raise ValueError("Not a serialized proof batch")
+    
+    offset = _BATCH_HEADER.size
+    proofs = []
+    for _ in range(count):
+        proof, offset = QuantumProof._decode(buffer, offset)
+        proofs.append(proof)
+    return proofs
+
+
+class ValidatorRegistry:
+    """
+    Registro de validadores com pertinência O(1) e slots inteiros estáveis.
+    
+    Cada nó recebe um slot (linha do armazenamento contíguo de estados do
+    QuantumStateManager) que não muda enquanto ele estiver registrado. Slots
+    liberados por deregister são reaproveitados pelos próximos registros.
+    A iteração segue a ordem de registro.
+    """
+    
+    def __init__(self):
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        # Maior slot já alocado + 1
+        self.high_water = 0
+    
+    def register(self, node_id: str) -> int:
+        """Registra um nó (se necessário) e retorna seu slot"""
+        slot = self._slots.get(node_id)
+        if slot is not None:
+            return slot
+        
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self.high_water
+            self.high_water += 1
+        self._slots[node_id] = slot
+        return slot
+    
+    def deregister(self, node_id: str) -> int:
+        """Remove um nó e libera seu slot, que é retornado"""
+        slot = self._slots.pop(node_id)
+        self._free.append(slot)
+        return slot
+    
+    def slot(self, node_id: str) -> int:
+        """Slot de um nó registrado (KeyError se não registrado)"""
+        return self._slots[node_id]
+    
+    def get(self, node_id: str) -> Optional[int]:
+        """Slot de um nó, ou None se não registrado"""
+        return self._slots.get(node_id)
+    
+    def slots(self, node_ids: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Slots de node_ids (padrão: todos, na ordem de registro)"""
+        if node_ids is None:
+            return np.fromiter(self._slots.values(), dtype=np.intp, count=len(self._slots))
+        return np.fromiter((self._slots[nid] for nid in node_ids),
+                           dtype=np.intp, count=len(node_ids))
+    
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._slots
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+    
+    def __repr__(self) -> str:
+        return f"ValidatorRegistry(validators={len(self)}, free_slots={len(self._free)})"
+
+
+class _StateView(Mapping):
+    """Visão somente leitura {node_id: estado} sobre o armazenamento contíguo"""
+    
+    def __init__(self, manager: 'QuantumStateManager'):
+        self._manager = manager
+    
+    def __getitem__(self, node_id: str) -> np.ndarray:
+        state = self._manager.get_state(node_id)
+        if state is None:
+            raise KeyError(node_id)
+        return state
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._manager.registry)
+    
+    def __len__(self) -> int:
+        return len(self._manager.registry)
 
 
 class QuantumStateManager:
-    """Gerencia estados quânticos dos nós da rede"""
+    """
+    Gerencia estados quânticos dos nós da rede.
+    
+    Os estados ficam numa única matriz (capacidade, 2ⁿ) complexa, uma linha
+    por slot do ValidatorRegistry, que cresce por duplicação. Versões e
+    valores esperados em cache também são arrays indexados por slot.
+    """
     
-    def __init__(self, n_qubits: int = 4):
+    def __init__(self, n_qubits: int = 4, capacity: int = 64):
         self.n_qubits = n_qubits
-        self.states = {}
+        self.dim = 2**n_qubits
+        self.registry = ValidatorRegistry()
+        self._store = np.zeros((capacity, self.dim), dtype=complex)
+        # Versão de cada slot, incrementada a cada escrita
+        self._versions = np.zeros(capacity, dtype=np.int64)
+        # Versão global, incrementada a cada escrita em qualquer estado
+        self.version = 0
+        # Coerência C de todos os estados, mantida a cada gravação de estado
+        self.coherence = IncrementalCoherence()
+        # Cache por operador: (versão do slot quando calculado, valor esperado)
+        self._expectations = {}
+        self.states = _StateView(self)
+    
+    @property
+    def capacity(self) -> int:
+        return len(self._store)
+    
+    def _ensure_capacity(self, n_slots: int):
+        """Dobra o armazenamento até comportar n_slots linhas"""
+        if n_slots <= self.capacity:
+            return
+        capacity = max(self.capacity, 1)
+        while capacity < n_slots:
+            capacity *= 2
         
+        store = np.zeros((capacity, self.dim), dtype=complex)
+        store[:self.capacity] = self._store
+        self._store = store
+        self._versions = self._grow(self._versions, capacity, 0)
+        self._expectations = {
+            op: (self._grow(versions, capacity, -1), self._grow(values, capacity, 0.0))
+            for op, (versions, values) in self._expectations.items()
+        }
+    
+    @staticmethod
+    def _grow(array: np.ndarray, capacity: int, fill) -> np.ndarray:
+        grown = np.full(capacity, fill, dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+    
+    def _expectation_cache(self, pauli_op: str) -> Tuple[np.ndarray, np.ndarray]:
+        if pauli_op not in self._expectations:
+            self._expectations[pauli_op] = (np.full(self.capacity, -1, dtype=np.int64),
+                                            np.zeros(self.capacity))
+        return self._expectations[pauli_op]
+    
     def create_random_state(self, node_id: str) -> np.ndarray:
         """Cria estado quântico aleatório para um nó"""
         state = random_statevector(2**self.n_qubits)
-        self.states[node_id] = state.data
+        self.register_state(node_id, state.data)
         return state.data
     
+    def create_random_states(self, node_ids: Sequence[str],
+                             seed: Optional[Union[int, np.random.Generator]] = None) -> np.ndarray:
+        """
+        Cria estados aleatórios (distribuição de Haar) para vários nós de uma vez.
+        
+        Os estados são vetores gaussianos complexos normalizados, sorteados
+        como uma única matriz (N, 2ⁿ) de um np.random.Generator e gravados
+        diretamente nos slots dos nós.
+        
+        Args:
+            node_ids: Nós (os não registrados são registrados); repetições são ignoradas
+            seed: Semente ou Generator, para registros reprodutíveis
+        
+        Returns:
+            Matriz (N, 2ⁿ) com os estados criados, na ordem de node_ids
+        """
+        node_ids = list(dict.fromkeys(node_ids))
+        rng = np.random.default_rng(seed)
+        
+        states = rng.standard_normal((len(node_ids), 2 * self.dim)).view(complex)
+        states /= np.sqrt(np.einsum('ij,ij->i', states.real, states.real)
+                          + np.einsum('ij,ij->i', states.imag, states.imag))[:, np.newaxis]
+        self.register_states(node_ids, states)
+        return states
+    
+    def register_states(self, node_ids: Sequence[str], new_states: np.ndarray):
+        """
+        Registra vários nós (distintos), se necessário, e grava seus estados.
+        Os valores esperados Z são calculados num único lote.
+        """
+        if len(node_ids) == 0:
+            return
+        slots = np.fromiter((self.registry.register(nid) for nid in node_ids),
+                            dtype=np.intp, count=len(node_ids))
+        self._ensure_capacity(int(slots.max()) + 1)
+        self._write_states(node_ids, slots, new_states)
+    
+    def update_states(self, node_ids: Sequence[str], new_states: np.ndarray):
+        """
+        Atualiza os estados de vários nós (distintos) já registrados de uma vez.
+        
+        Raises:
+            KeyError: Se algum nó não estiver registrado (nada é alterado)
+        """
+        if len(node_ids) == 0:
+            return
+        unknown = [nid for nid in node_ids if nid not in self.registry]
+        if unknown:
+            raise KeyError(f"Nodes not registered as validators: {unknown[:5]}"
+                           f"{' ...' if len(unknown) > 5 else ''}")
+        self._write_states(node_ids, self.registry.slots(node_ids), new_states)
+    
+    def _write_states(self, node_ids: Sequence[str], slots: np.ndarray,
+                      new_states: np.ndarray):
+        self._store[slots] = new_states
+        self._versions[slots] += 1
+        self.version += 1
+        
+        values = batch_pauli_expectations(self._store[slots], 'Z')
+        versions, cached = self._expectation_cache('Z')
+        versions[slots] = self._versions[slots]
+        cached[slots] = values
+        self.coherence.update(zip(node_ids, values.tolist()))
+    
     def get_state(self, node_id: str) -> Optional[np.ndarray]:
-        """Retorna estado quântico de um nó"""
-        return self.states.get(node_id)
+        """Retorna estado quântico de um nó (visão somente leitura da sua linha)"""
+        slot = self.registry.get(node_id)
+        if slot is None:
+            return None
+        state = self._store[slot]
+        state.flags.writeable = False
+        return state
+    
+    def get_states(self, node_ids: Sequence[str]) -> np.ndarray:
+        """Estados de node_ids empilhados numa matriz (N, 2ⁿ) (cópia)"""
+        return self._store[self.registry.slots(node_ids)]
+    
+    def register_state(self, node_id: str, new_state: np.ndarray):
+        """Registra um nó, se necessário, e grava seu estado quântico"""
+        slot = self.registry.register(node_id)
+        self._ensure_capacity(slot + 1)
+        self._write_state(node_id, slot, new_state)
     
     def update_state(self, node_id: str, new_state: np.ndarray):
-        """Atualiza estado quântico de um nó"""
-        self.states[node_id] = new_state
+        """
+        Atualiza estado quântico de um nó já registrado.
+        
+        O valor esperado Z do novo estado é calculado na hora e a coerência
+        incremental é ajustada em O(1). O registro é explícito
+        (register_state / PoQCConsensus.register_validator).
+        
+        Raises:
+            KeyError: Se o nó não estiver registrado
+        """
+        slot = self.registry.get(node_id)
+        if slot is None:
+            raise KeyError(f"Node {node_id} is not registered as a validator")
+        self._write_state(node_id, slot, new_state)
+    
+    def _write_state(self, node_id: str, slot: int, new_state: np.ndarray):
+        self._store[slot] = new_state
+        self._versions[slot] += 1
+        self.version += 1
+        
+        value = pauli_expectation(self._store[slot], 'Z')
+        versions, values = self._expectation_cache('Z')
+        versions[slot] = self._versions[slot]
+        values[slot] = value
+        self.coherence.set(node_id, value)
+    
+    def remove_state(self, node_id: str):
+        """Remove o estado de um nó e libera seu slot"""
+        slot = self.registry.deregister(node_id)
+        self._store[slot] = 0.0
+        self._versions[slot] += 1
+        self.version += 1
+        self.coherence.remove(node_id)
+    
+    def current_coherence(self) -> float:
+        """Coerência C de todos os estados gerenciados, sem recálculo completo"""
+        return self.coherence.value()
+    
+    def get_expectation(self, node_id: str, pauli_op: str = 'Z') -> float:
+        """
+        Retorna ⟨ψ|P⊗ⁿ|ψ⟩ do estado de um nó, calculado uma vez por versão
+        do estado.
+        """
+        return float(self.get_expectations([node_id], pauli_op)[0])
+    
+    def get_expectations(self, node_ids: Sequence[str], pauli_op: str = 'Z') -> np.ndarray:
+        """
+        Valores esperados (em cache) de vários nós, na ordem de node_ids.
+        
+        Os estados sem valor em cache são avaliados juntos, numa única
+        chamada de batch_pauli_expectations sobre as linhas do armazenamento.
+        """
+        slots = self.registry.slots(node_ids)
+        versions, values = self._expectation_cache(pauli_op)
+        
+        stale = slots[versions[slots] != self._versions[slots]]
+        if len(stale):
+            values[stale] = batch_pauli_expectations(self._store[stale], pauli_op)
+            versions[stale] = self._versions[stale]
+        
+        return values[slots]
+
+
+PAULI_BACKENDS = ('numpy', 'qiskit')
+
+
+@lru_cache(maxsize=None)
+def _parity_signs(n_qubits: int) -> np.ndarray:
+    """(-1)^popcount(k) para cada índice k da base computacional"""
+    indices = np.arange(2**n_qubits)
+    parity = np.zeros(2**n_qubits, dtype=np.int64)
+    for bit in range(n_qubits):
+        parity ^= (indices >> bit) & 1
+    signs = 1.0 - 2.0 * parity
+    signs.setflags(write=False)
+    return signs
+
+
+def batch_pauli_expectations(states: np.ndarray, pauli_op: str = 'Z',
+                             backend: str = 'numpy') -> np.ndarray:
+    """
+    Calcula ⟨ψ|P⊗ⁿ|ψ⟩ para uma matriz (N, 2ⁿ) de estados de uma só vez.
+    
+    O kernel NumPy usa que:
+    - Z⊗ⁿ é diagonal com sinais (-1)^popcount(k);
+    - X⊗ⁿ inverte todos os bits, |k⟩ → |k ⊕ (2ⁿ-1)⟩ = |2ⁿ-1-k⟩, ou seja,
+      inverte a ordem das amplitudes;
+    - Y⊗ⁿ|k⟩ = iⁿ (-1)^popcount(k) |2ⁿ-1-k⟩.
+    
+    Args:
+        states: Estados empilhados, formato (N, 2ⁿ) ou (2ⁿ,)
+        pauli_op: Operador de Pauli ('X', 'Y', 'Z'), aplicado a todos os qubits
+        backend: 'numpy' (padrão) ou 'qiskit' (verificação cruzada)
+    
+    Returns:
+        Array (N,) de valores esperados reais
+    """
+    if backend not in PAULI_BACKENDS:
+        raise ValueError(f"Unknown Pauli backend '{backend}', expected one of {PAULI_BACKENDS}")
+    if pauli_op not in ('X', 'Y', 'Z'):
+        raise ValueError(f"Unsupported Pauli operator '{pauli_op}'")
+    
+    states = np.atleast_2d(states)
+    dim = states.shape[1]
+    n_qubits = dim.bit_length() - 1
+    if dim != 2**n_qubits:
+        raise ValueError(f"State dimension {dim} is not a power of 2")
+    
+    if backend == 'qiskit':
+        pauli = Pauli(pauli_op * n_qubits)
+        return np.array([Statevector(state).expectation_value(pauli).real
+                         for state in states])
+    
+    signs = _parity_signs(n_qubits)
+    if pauli_op == 'Z':
+        probabilities = states.real**2 + states.imag**2
+        return probabilities @ signs
+    
+    flipped = states[:, ::-1]
+    if pauli_op == 'X':
+        return np.einsum('ij,ij->i', states.conj(), flipped).real
+    
+    return (1j**n_qubits * np.einsum('ij,ij->i', flipped.conj(), states * signs)).real
+
+
+def pauli_expectation(state: np.ndarray, pauli_op: str = 'Z',
+                      backend: str = 'numpy') -> float:
+    """
+    Calcula o valor esperado ⟨ψ|P⊗ⁿ|ψ⟩ de um estado quântico.
+    
+    Args:
+        state: Estado quântico
+        pauli_op: Operador de Pauli ('X', 'Y', 'Z'), aplicado a todos os qubits
+        backend: 'numpy' (padrão) ou 'qiskit'
+    
+    Returns:
+        Valor esperado (real)
+    """
+    return float(batch_pauli_expectations(state, pauli_op, backend)[0])
 
 
 def compute_pauli_measurement(state1: np.ndarray, state2: np.ndarray, 
-                            pauli_op: str = 'Z') -> float:
+                            pauli_op: str = 'Z', backend: str = 'numpy') -> float:
     """
     Calcula medida de Pauli entre dois estados quânticos.
     
     Args:
         state1, state2: Estados quânticos
         pauli_op: Operador de Pauli ('X', 'Y', 'Z')
+        backend: 'numpy' (padrão) ou 'qiskit'
     
     Returns:
         Valor da medida σᵢⱼ
     """
-    # Converte para objetos Statevector do Qiskit
-    psi1 = Statevector(state1)
-    psi2 = Statevector(state2)
+    # σᵢⱼ é o produto dos valores esperados de cada estado
+    expectations = batch_pauli_expectations(np.stack([state1, state2]), pauli_op, backend)
+    return float(expectations[0] * expectations[1])
+
+
+def coherence_from_expectations(expectations: np.ndarray) -> float:
+    """
+    Calcula C = (1/N) ∑ᵢ ∏ⱼ≠ᵢ σᵢⱼ a partir dos valores esperados eᵢ.
     
-    # Cria operador de Pauli
-    n_qubits = int(np.log2(len(state1)))
-    pauli = Pauli(pauli_op * n_qubits)
+    Como σᵢⱼ = eᵢ·eⱼ, cada termo vale eᵢᴺ⁻² · ∏ⱼ eⱼ, e C sai de um único
+    produto global em O(N). Se algum eᵢ é zero, todos os termos se anulam.
+    O produto é acumulado em escala logarítmica para evitar underflow
+    intermediário com muitos nós.
     
-    # Calcula valor esperado
-    expectation1 = psi1.expectation_value(pauli).real
-    expectation2 = psi2.expectation_value(pauli).real
+    Args:
+        expectations: Valores esperados eᵢ de cada nó
+    
+    Returns:
+        Parâmetro de coerência C
+    """
+    expectations = np.asarray(expectations, dtype=float)
+    N = len(expectations)
+    
+    if N < 2:
+        return 1.0
+    if np.any(expectations == 0.0):
+        return 0.0
     
-    # Retorna produto das medidas
-    return expectation1 * expectation2
+    log_abs = np.log(np.abs(expectations))
+    negative = expectations < 0
+    
+    log_product = np.sum(log_abs)
+    product_sign = -1.0 if np.count_nonzero(negative) % 2 else 1.0
+    
+    # Sinal de eᵢᴺ⁻²: negativo só se eᵢ < 0 e N - 2 é ímpar
+    term_signs = np.where(negative & ((N - 2) % 2 == 1), -product_sign, product_sign)
+    terms = term_signs * np.exp((N - 2) * log_abs + log_product)
+    
+    return float(np.sum(terms) / N)
 
 
-def compute_coherence_parameter(nodes_states: Dict[str, np.ndarray]) -> float:
+def compute_coherence_parameter(nodes_states: Dict[str, np.ndarray],
+                                expectations: Optional[np.ndarray] = None) -> float:
     """
     Calcula parâmetro de coerência quântica:
     C = (1/N) ∑ᵢ₌₁ᴺ ∏ⱼ₌₁ᴺ σᵢⱼ
     
     Args:
         nodes_states: Dicionário {node_id: quantum_state}
+        expectations: Valores esperados já calculados, na ordem de
+            nodes_states (evita recalculá-los)
     
     Returns:
         Parâmetro de coerência C
     """
-    node_ids = list(nodes_states.keys())
-    N = len(node_ids)
-    
-    if N < 2:
-        return 1.0
-    
-    total_coherence = 0.0
-    
-    for i in range(N):
-        node_product = 1.0
-        state_i = nodes_states[node_ids[i]]
-        
-        for j in range(N):
-            if i != j:
-                state_j = nodes_states[node_ids[j]]
-                sigma_ij = compute_pauli_measurement(state_i, state_j)
-                node_product *= sigma_ij
-                
-        total_coherence += node_product
+    if expectations is None:
+        if len(nodes_states) < 2:
+            return 1.0
+        expectations = batch_pauli_expectations(np.stack(list(nodes_states.values())))
     
-    return total_coherence / N
+    return coherence_from_expectations(expectations)
 
 
 def compute_fraud_probability(coherence_current: float, 
@@ -141,6 +656,351 @@ def compute_fraud_probability(coherence_current: float,
     return 1.0 - np.exp(-lambda_param * delta_C)
 
 
+class IncrementalCoherence:
+    """
+    Mantém C = (1/N) ∑ᵢ ∏ⱼ≠ᵢ σᵢⱼ atualizado sob alterações de um eᵢ por vez.
+    
+    Usa a mesma decomposição de coherence_from_expectations,
+    C = sinal(P)·exp(log|P|)·∑ᵢ eᵢᴺ⁻² / N, guardando a contagem de zeros,
+    a paridade de negativos, ∑ log|eᵢ| e ∑ eᵢᴺ⁻². Atualizar um eᵢ custa O(1);
+    inserir ou remover nós muda o expoente N - 2 e agenda uma reconstrução
+    O(N), feita apenas na próxima leitura. Reconstruções periódicas limitam
+    o acúmulo de erro de arredondamento.
+    """
+    
+    def __init__(self, rebuild_interval: int = 4096):
+        self.values: Dict[str, float] = {}
+        self.rebuild_interval = rebuild_interval
+        self._dirty = True
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def set(self, key: str, value: float):
+        """Insere ou atualiza o valor esperado eᵢ de um nó"""
+        value = float(value)
+        old = self.values.get(key)
+        self.values[key] = value
+        
+        if old is None or self._dirty:
+            self._dirty = True
+            return
+        
+        self._remove_term(old)
+        self._add_term(value)
+        self._updates += 1
+        if self._updates >= self.rebuild_interval:
+            self._dirty = True
+    
+    def update(self, items):
+        """Insere ou atualiza vários pares (nó, eᵢ); agenda uma reconstrução"""
+        self.values.update((key, float(value)) for key, value in items)
+        self._dirty = True
+    
+    def remove(self, key: str):
+        """Remove um nó"""
+        del self.values[key]
+        self._dirty = True
+    
+    def _add_term(self, value: float):
+        if value == 0.0:
+            self._zero_count += 1
+            return
+        self._log_abs_sum += math.log(abs(value))
+        self._negative_count += value < 0
+        self._power_sum += value ** self._exponent
+    
+    def _remove_term(self, value: float):
+        if value == 0.0:
+            self._zero_count -= 1
+            return
+        self._log_abs_sum -= math.log(abs(value))
+        self._negative_count -= value < 0
+        self._power_sum -= value ** self._exponent
+    
+    def rebuild(self):
+        """Recalcula todos os acumuladores a partir dos valores atuais, em O(N)"""
+        self._exponent = max(len(self.values) - 2, 0)
+        self._zero_count = 0
+        self._negative_count = 0
+        self._log_abs_sum = 0.0
+        self._power_sum = 0.0
+        self._updates = 0
+        for value in self.values.values():
+            self._add_term(value)
+        self._dirty = False
+    
+    def value(self) -> float:
+        """Coerência C atual"""
+        N = len(self.values)
+        if N < 2:
+            return 1.0
+        if self._dirty:
+            self.rebuild()
+        if self._zero_count:
+            return 0.0
+        
+        sign = -1.0 if self._negative_count % 2 else 1.0
+        return sign * math.exp(self._log_abs_sum) * self._power_sum / N
+
+
+class ConsensusRoundContext:
+    """
+    Snapshot dos estados dos validadores para uma rodada de consenso.
+    
+    Os estados e seus valores esperados são lidos uma vez; a coerência C e
+    as medidas σᵢⱼ = eᵢ·eⱼ são derivadas do snapshot e compartilhadas entre
+    a geração e a validação de todas as provas da rodada. O contexto deixa
+    de ser válido assim que qualquer estado é alterado no QuantumStateManager.
+    """
+    
+    def __init__(self, node_ids: List[str], states: np.ndarray,
+                 expectations: np.ndarray, state_version: int,
+                 coherence: Optional[float] = None):
+        self.node_ids = node_ids
+        self.index = {nid: i for i, nid in enumerate(node_ids)}
+        self.states = states
+        self.expectations = expectations
+        self.state_version = state_version
+        self.coherence = (coherence if coherence is not None
+                          else coherence_from_expectations(expectations))
+    
+    @classmethod
+    def snapshot(cls, state_manager: QuantumStateManager,
+                 node_ids: List[str]) -> 'ConsensusRoundContext':
+        """Cria o contexto a partir do estado atual de node_ids"""
+        states = state_manager.get_states(node_ids)
+        expectations = state_manager.get_expectations(node_ids)
+        
+        # Se o snapshot cobre todos os estados, C já está mantido pelo gerenciador
+        coherence = None
+        if len(node_ids) == len(state_manager.registry):
+            coherence = state_manager.current_coherence()
+        return cls(node_ids, states, expectations, state_manager.version, coherence)
+    
+    def is_current(self, state_manager: QuantumStateManager) -> bool:
+        """Indica se nenhum estado mudou desde o snapshot"""
+        return state_manager.version == self.state_version
+    
+    def get_state(self, node_id: str) -> np.ndarray:
+        return self.states[self.index[node_id]]
+    
+    def sigma_row(self, node_id: str) -> np.ndarray:
+        """Medidas σᵢⱼ do nó i com todos os nós j do snapshot"""
+        return self.expectations[self.index[node_id]] * self.expectations
+    
+    def pauli_measurements(self, node_id: str) -> Dict[str, float]:
+        """Medidas σᵢⱼ do nó com os demais nós, como {node_id: σᵢⱼ}"""
+        i = self.index[node_id]
+        row = self.sigma_row(node_id).tolist()
+        return {nid: row[j] for j, nid in enumerate(self.node_ids) if j != i}
+
+
+# Idade máxima aceita de uma prova, em segundos (5 minutos)
+PROOF_MAX_AGE = 300.0
+
+
+class ProofReplayCache:
+    """
+    Conjunto limitado das assinaturas de provas já vistas.
+    
+    As assinaturas são agrupadas em baldes de `bucket_width` segundos pelo
+    timestamp da prova. Uma prova mais velha que `window` já é rejeitada pela
+    verificação de idade, então baldes inteiros fora da janela são descartados
+    de uma vez. Além disso, no máximo `max_entries` assinaturas são mantidas
+    (os baldes mais antigos saem primeiro). Seguro para uso entre threads.
+    """
+    
+    def __init__(self, window: float = PROOF_MAX_AGE, bucket_width: float = 10.0,
+                 max_entries: int = 1_000_000):
+        if bucket_width <= 0:
+            raise ValueError("Bucket width must be positive")
+        if max_entries < 1:
+            raise ValueError("Replay cache must hold at least one entry")
+        self.window = window
+        self.bucket_width = bucket_width
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # {assinatura: balde} e {balde: assinaturas}, com heap dos baldes
+        self._seen: Dict[str, int] = {}
+        self._buckets: Dict[int, List[str]] = {}
+        self._bucket_heap: List[int] = []
+        self._lock = threading.Lock()
+    
+    def _bucket(self, timestamp: float) -> int:
+        return math.floor(timestamp / self.bucket_width)
+    
+    def check_and_add(self, signature: str, timestamp: float,
+                      now: Optional[float] = None) -> bool:
+        """
+        Registra uma assinatura.
+        
+        Returns:
+            True se a assinatura é nova, False se é uma repetição
+        """
+        now = time.time() if now is None else now
+        bucket = self._bucket(timestamp)
+        
+        with self._lock:
+            if signature in self._seen:
+                self.hits += 1
+                return False
+            
+            self.misses += 1
+            self._expire(now)
+            # Provas já fora da janela não precisam ser lembradas
+            if bucket >= self._bucket(now - self.window):
+                self._insert(signature, bucket)
+            return True
+    
+    def add(self, signature: str, timestamp: float, now: Optional[float] = None):
+        """Marca uma assinatura como vista, sem contar acerto ou falta"""
+        now = time.time() if now is None else now
+        bucket = self._bucket(timestamp)
+        with self._lock:
+            if signature not in self._seen:
+                self._expire(now)
+                if bucket >= self._bucket(now - self.window):
+                    self._insert(signature, bucket)
+    
+    def _insert(self, signature: str, bucket: int):
+        if bucket not in self._buckets:
+            self._buckets[bucket] = []
+            heapq.heappush(self._bucket_heap, bucket)
+        self._buckets[bucket].append(signature)
+        self._seen[signature] = bucket
+        
+        while len(self._seen) > self.max_entries:
+            self.evictions += self._drop_oldest_bucket()
+    
+    def _expire(self, now: float):
+        """Descarta os baldes inteiramente fora da janela de validade"""
+        cutoff = self._bucket(now - self.window)
+        while self._bucket_heap and self._bucket_heap[0] < cutoff:
+            self._drop_oldest_bucket()
+    
+    def _drop_oldest_bucket(self) -> int:
+        bucket = heapq.heappop(self._bucket_heap)
+        signatures = self._buckets.pop(bucket)
+        for signature in signatures:
+            del self._seen[signature]
+        return len(signatures)
+    
+    def clear(self):
+        """Esquece todas as assinaturas (os contadores são mantidos)"""
+        with self._lock:
+            self._seen.clear()
+            self._buckets.clear()
+            self._bucket_heap.clear()
+    
+    def __contains__(self, signature: str) -> bool:
+        return signature in self._seen
+    
+    def __len__(self) -> int:
+        return len(self._seen)
+    
+    def stats(self) -> Dict[str, float]:
+        """Contadores de acertos (repetições rejeitadas), faltas e descartes"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._seen),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions
+        }
+
+
+EXECUTOR_TYPES = ('thread', 'process')
+
+# Novos snapshots permitidos por contexto (comitê) numa rodada quando estados
+# mudam durante ela; além disso, os blocos restantes são validados com o
+# último snapshot
+MAX_ROUND_RESNAPSHOTS = 3
+
+
+def _build_proof(node_id: str, context: ConsensusRoundContext) -> QuantumProof:
+    """Monta a prova quântica de um nó a partir do snapshot da rodada"""
+    # Obtém estado atual do nó
+    quantum_state = context.get_state(node_id)
+    
+    # Calcula medidas de Pauli com outros nós (σᵢⱼ = eᵢ·eⱼ do snapshot)
+    pauli_measurements = context.pauli_measurements(node_id)
+    
+    # Coerência atual, calculada uma vez por rodada
+    coherence_value = context.coherence
+    
+    # Gera assinatura
+    proof_data = f"{node_id}{time.time()}{coherence_value}"
+    signature = hashlib.sha256(proof_data.encode()).hexdigest()
+    
+    return QuantumProof(
+        node_id=node_id,
+        timestamp=time.time(),
+        quantum_state=quantum_state,
+        pauli_measurements=pauli_measurements,
+        coherence_value=coherence_value,
+        signature=signature
+    )
+
+
+def _check_proof(proof: QuantumProof, expected_coherence: float,
+                 baseline_coherence: Optional[float], lambda_param: float,
+                 fraud_threshold: float) -> Tuple[bool, str]:
+    """Verificações de uma prova que não dependem do estado do consenso"""
+    # Verifica timestamp (não pode ser muito antigo)
+    current_time = time.time()
+    if current_time - proof.timestamp > PROOF_MAX_AGE:
+        return False, "Proof is too old"
+    
+    # Verifica se coerência na prova está próxima da esperada
+    coherence_diff = abs(proof.coherence_value - expected_coherence)
+    if coherence_diff > 0.1:  # Tolerância
+        return False, f"Coherence mismatch: {coherence_diff}"
+    
+    # Calcula probabilidade de fraude
+    if baseline_coherence is not None:
+        fraud_prob = compute_fraud_probability(
+            proof.coherence_value, 
+            baseline_coherence, 
+            lambda_param
+        )
+        
+        if fraud_prob > fraud_threshold:
+            return False, f"High fraud probability: {fraud_prob:.3f}"
+    
+    return True, "Proof validated successfully"
+
+
+def _process_round_chunk(context: ConsensusRoundContext, node_ids: List[str],
+                         baseline_coherence: Optional[float], lambda_param: float,
+                         fraud_threshold: float) -> List[Tuple[str, Optional[dict], bool, str]]:
+    """
+    Gera e valida as provas de um bloco de validadores de uma rodada.
+    
+    Função de módulo (e argumentos serializáveis) para poder rodar num
+    ProcessPoolExecutor. Retorna, na ordem de node_ids, tuplas
+    (validador, prova serializada ou None, válida, mensagem).
+    """
+    outcomes = []
+    for node_id in node_ids:
+        try:
+            proof = _build_proof(node_id, context)
+        except Exception as e:
+            outcomes.append((node_id, None, False, f"Error generating proof: {str(e)}"))
+            continue
+        
+        try:
+            is_valid, message = _check_proof(proof, context.coherence, baseline_coherence,
+                                             lambda_param, fraud_threshold)
+        except Exception as e:
+            is_valid, message = False, f"Validation error: {str(e)}"
+        outcomes.append((node_id, proof.to_dict(), is_valid, message))
+    return outcomes
+
+
 class PoQCConsensus:
     """
     Protocolo de Consenso Proof-of-Quantum-Coherence
@@ -148,110 +1008,350 @@ class PoQCConsensus:
     Implementa validação baseada em coerência quântica entre nós da rede.
     """
     
-    def __init__(self, lambda_param: float = 1.0, fraud_threshold: float = 0.7):
+    def __init__(self, lambda_param: float = 1.0, fraud_threshold: float = 0.7,
+                 max_workers: Optional[int] = None, executor_type: str = 'thread',
+                 executor: Optional[Executor] = None, chunk_size: Optional[int] = None,
+                 replay_cache_size: int = 1_000_000,
+                 committee_size: Optional[int] = None, committee_seed: int = 0):
+        """
+        Args:
+            lambda_param: Sensibilidade λ da probabilidade de fraude
+            fraud_threshold: Probabilidade acima da qual a prova é rejeitada
+            max_workers: Se fornecido (e executor for None), as rodadas geram e
+                validam provas num pool próprio com esse número de workers
+            executor_type: Tipo do pool próprio, 'thread' ou 'process'
+            executor: Executor externo para as rodadas
+            chunk_size: Validadores por tarefa (padrão: ~4 tarefas por worker)
+            replay_cache_size: Máximo de assinaturas lembradas contra repetição
+            committee_size: Se fornecido, cada rodada divide os validadores em
+                comitês de pelo menos esse tamanho, e a coerência C é calculada
+                por comitê (modo fragmentado)
+            committee_seed: Semente da atribuição de comitês de cada rodada
+        """
+        if executor_type not in EXECUTOR_TYPES:
+            raise ValueError(f"Unknown executor type '{executor_type}', "
+                             f"expected one of {EXECUTOR_TYPES}")
+        if committee_size is not None and committee_size < 2:
+            raise ValueError("Committees need at least 2 validators")
         self.lambda_param = lambda_param
         self.fraud_threshold = fraud_threshold
+        self.max_workers = max_workers
+        self.executor_type = executor_type
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self._own_executor = False
+        self.replay_cache = ProofReplayCache(max_entries=replay_cache_size)
         self.state_manager = QuantumStateManager()
         self.baseline_coherence = None
-        self.validators = []
+        # Registro compartilhado com o gerenciador: cada validador ocupa um
+        # slot no armazenamento de estados
+        self.validators = self.state_manager.registry
+        self._round_context = None
+        self.committee_size = committee_size
+        self.committee_seed = committee_seed
+        self.round_number = 0
+        # Contexto do comitê de cada validador na última rodada fragmentada
+        self._committee_contexts: Dict[str, ConsensusRoundContext] = {}
         
     def register_validator(self, node_id: str) -> str:
         """Registra um nó como validador"""
         if node_id not in self.validators:
-            self.validators.append(node_id)
-            # Cria estado quântico inicial
+            # Cria estado quântico inicial (e aloca o slot do validador)
             self.state_manager.create_random_state(node_id)
             return f"Validator {node_id} registered successfully"
         return f"Validator {node_id} already registered"
     
-    def generate_quantum_proof(self, node_id: str) -> QuantumProof:
+    def register_validators(self, node_ids: Sequence[str],
+                            seed: Optional[Union[int, np.random.Generator]] = None) -> int:
+        """
+        Registra vários validadores de uma vez, com estados iniciais sorteados
+        em lote (reprodutíveis via seed).
+        
+        Returns:
+            Número de validadores efetivamente registrados (os já
+            registrados são mantidos como estão)
+        """
+        new_ids = [nid for nid in dict.fromkeys(node_ids) if nid not in self.validators]
+        self.state_manager.create_random_states(new_ids, seed)
+        return len(new_ids)
+    
+    def deregister_validator(self, node_id: str) -> str:
+        """Remove um validador e libera seu slot de estado"""
+        if node_id not in self.validators:
+            return f"Validator {node_id} is not registered"
+        self.state_manager.remove_state(node_id)
+        return f"Validator {node_id} deregistered successfully"
+    
+    def get_round_context(self, context: Optional[ConsensusRoundContext] = None
+                          ) -> ConsensusRoundContext:
+        """
+        Retorna um contexto de rodada válido para os estados atuais.
+        
+        Reaproveita `context` (ou o último contexto criado) enquanto nenhum
+        estado mudar; caso contrário, tira um novo snapshot.
+        """
+        if context is not None and context.is_current(self.state_manager):
+            return context
+        if (self._round_context is None
+                or not self._round_context.is_current(self.state_manager)):
+            self._round_context = ConsensusRoundContext.snapshot(
+                self.state_manager, self._validators_with_state()
+            )
+        return self._round_context
+    
+    def assign_committees(self, round_number: Optional[int] = None) -> List[List[str]]:
+        """
+        Divide os validadores em comitês para uma rodada.
+        
+        A atribuição é uma permutação dos validadores (ordenados por id)
+        gerada a partir de (committee_seed, round_number), portanto é a mesma
+        em qualquer nó que conheça o conjunto de validadores. São formados
+        max(1, N // committee_size) comitês de tamanhos que diferem no máximo
+        em um.
+        """
+        if self.committee_size is None:
+            return [list(self.validators)]
+        
+        round_number = self.round_number if round_number is None else round_number
+        node_ids = sorted(self.validators)
+        rng = np.random.default_rng([self.committee_seed, round_number])
+        order = rng.permutation(len(node_ids))
+        
+        n_committees = max(1, len(node_ids) // self.committee_size)
+        return [[node_ids[i] for i in members]
+                for members in np.array_split(order, n_committees)]
+    
+    def get_committee_contexts(self, round_number: Optional[int] = None
+                               ) -> List[ConsensusRoundContext]:
+        """Snapshot de cada comitê da rodada (C calculado dentro do comitê)"""
+        contexts = [ConsensusRoundContext.snapshot(self.state_manager, committee)
+                    for committee in self.assign_committees(round_number)]
+        self._committee_contexts = {nid: context for context in contexts
+                                    for nid in context.node_ids}
+        return contexts
+    
+    def generate_quantum_proof(self, node_id: str,
+                               context: Optional[ConsensusRoundContext] = None) -> QuantumProof:
         """Gera prova quântica para um nó validador"""
         if node_id not in self.validators:
             raise ValueError(f"Node {node_id} is not a registered validator")
         
-        # Obtém estado atual do nó
-        quantum_state = self.state_manager.get_state(node_id)
-        
-        # Calcula medidas de Pauli com outros nós
-        pauli_measurements = {}
-        for other_node in self.validators:
-            if other_node != node_id:
-                other_state = self.state_manager.get_state(other_node)
-                if other_state is not None:
-                    sigma_val = compute_pauli_measurement(quantum_state, other_state)
-                    pauli_measurements[other_node] = sigma_val
-        
-        # Calcula coerência atual
-        all_states = {nid: self.state_manager.get_state(nid) 
-                     for nid in self.validators 
-                     if self.state_manager.get_state(nid) is not None}
-        coherence_value = compute_coherence_parameter(all_states)
-        
-        # Gera assinatura
-        proof_data = f"{node_id}{time.time()}{coherence_value}"
-        signature = hashlib.sha256(proof_data.encode()).hexdigest()
-        
-        return QuantumProof(
-            node_id=node_id,
-            timestamp=time.time(),
-            quantum_state=quantum_state,
-            pauli_measurements=pauli_measurements,
-            coherence_value=coherence_value,
-            signature=signature
-        )
+        if context is None and self.committee_size is not None:
+            context = self._committee_context(node_id)
+        return _build_proof(node_id, self.get_round_context(context))
+    
+    def _committee_context(self, node_id: str) -> ConsensusRoundContext:
+        """
+        Contexto válido do comitê do nó na última rodada fragmentada.
+        
+        Se o contexto guardado estiver desatualizado, só esse comitê é
+        refeito; um nó sem contexto guardado usa o seu comitê na atribuição
+        da última rodada. O resultado é guardado para todos os membros.
+        """
+        context = self._committee_contexts.get(node_id)
+        if context is None:
+            committee = next(members for members in
+                             self.assign_committees(max(self.round_number - 1, 0))
+                             if node_id in members)
+            context = ConsensusRoundContext.snapshot(self.state_manager, committee)
+        elif context.is_current(self.state_manager):
+            return context
+        else:
+            context = self._resnapshot(context)
+        for nid in context.node_ids:
+            self._committee_contexts[nid] = context
+        return context
     
-    def validate_quantum_proof(self, proof: QuantumProof) -> Tuple[bool, str]:
+    def validate_quantum_proof(self, proof: QuantumProof,
+                               context: Optional[ConsensusRoundContext] = None) -> Tuple[bool, str]:
         """Valida uma prova quântica"""
         try:
             # Verifica se o nó é validador registrado
             if proof.node_id not in self.validators:
                 return False, "Node is not a registered validator"
             
-            # Verifica timestamp (não pode ser muito antigo)
-            current_time = time.time()
-            if current_time - proof.timestamp > 300:  # 5 minutos
-                return False, "Proof is too old"
-            
-            # Reconstrói estados para verificação
-            all_states = {nid: self.state_manager.get_state(nid) 
-                         for nid in self.validators 
-                         if self.state_manager.get_state(nid) is not None}
+            # Rejeita repetições antes de qualquer cálculo quântico
+            if not self.replay_cache.check_and_add(proof.signature, proof.timestamp):
+                return False, "Duplicate proof (replay)"
             
-            # Calcula coerência esperada
-            expected_coherence = compute_coherence_parameter(all_states)
+            # Coerência esperada: a do snapshot da rodada (ou do comitê do nó,
+            # refeito se preciso, no modo fragmentado), se ainda válido, ou a
+            # mantida incrementalmente pelo gerenciador de estados
+            if context is None and self.committee_size is not None:
+                context = self._committee_context(proof.node_id)
+            if context is not None and context.is_current(self.state_manager):
+                expected_coherence = context.coherence
+            else:
+                expected_coherence = self.current_coherence()
             
-            # Verifica se coerência na prova está próxima da esperada
-            coherence_diff = abs(proof.coherence_value - expected_coherence)
-            if coherence_diff > 0.1:  # Tolerância
-                return False, f"Coherence mismatch: {coherence_diff}"
-            
-            # Calcula probabilidade de fraude
-            if self.baseline_coherence is not None:
-                fraud_prob = compute_fraud_probability(
-                    proof.coherence_value, 
-                    self.baseline_coherence, 
-                    self.lambda_param
-                )
-                
-                if fraud_prob > self.fraud_threshold:
-                    return False, f"High fraud probability: {fraud_prob:.3f}"
-            
-            return True, "Proof validated successfully"
+            return _check_proof(proof, expected_coherence, self.baseline_coherence,
+                                self.lambda_param, self.fraud_threshold)
             
         except Exception as e:
             return False, f"Validation error: {str(e)}"
     
     def update_baseline_coherence(self):
         """Atualiza coerência de referência baseada nos validadores ativos"""
-        all_states = {nid: self.state_manager.get_state(nid) 
-                     for nid in self.validators 
-                     if self.state_manager.get_state(nid) is not None}
+        if len(self.validators) >= 2:
+            self.baseline_coherence = self.current_coherence()
+    
+    def current_coherence(self) -> float:
+        """Coerência C atual dos validadores, mantida incrementalmente"""
+        return self.state_manager.current_coherence()
+    
+    def get_replay_stats(self) -> Dict[str, float]:
+        """Estatísticas do cache de repetição de provas"""
+        return self.replay_cache.stats()
+    
+    def _validators_with_state(self) -> List[str]:
+        """Validadores que possuem estado quântico, na ordem de registro"""
+        # Todo validador registrado ocupa um slot com estado
+        return list(self.validators)
+    
+    def _get_executor(self) -> Optional[Executor]:
+        """Executor das rodadas (criado sob demanda se max_workers foi dado)"""
+        if self.executor is None and self.max_workers is not None:
+            pool_cls = ThreadPoolExecutor if self.executor_type == 'thread' else ProcessPoolExecutor
+            self.executor = pool_cls(max_workers=self.max_workers)
+            self._own_executor = True
+        return self.executor
+    
+    def close(self):
+        """Encerra o pool próprio de workers, se houver"""
+        if self._own_executor:
+            self.executor.shutdown()
+            self.executor = None
+            self._own_executor = False
+    
+    def _resnapshot(self, context: ConsensusRoundContext) -> ConsensusRoundContext:
+        """
+        Contexto válido para os validadores de `context` (todos os atuais, na
+        rodada global; os membros ainda registrados, num comitê).
+        
+        Se nenhum desses estados mudou, o próprio `context` é revalidado e
+        retornado, e as provas já feitas com ele continuam valendo.
+        """
+        if self.committee_size is None:
+            node_ids = self._validators_with_state()
+        else:
+            node_ids = [nid for nid in context.node_ids if nid in self.validators]
+        fresh = ConsensusRoundContext.snapshot(self.state_manager, node_ids)
+        if fresh.node_ids == context.node_ids and np.array_equal(fresh.states, context.states):
+            context.state_version = fresh.state_version
+            return context
+        if self.committee_size is None:
+            self._round_context = fresh
+        return fresh
+    
+    async def _process_round(self, contexts: Sequence[ConsensusRoundContext]
+                             ) -> Tuple[List[ConsensusRoundContext],
+                                        List[List[Tuple[str, Optional[dict], bool, str]]],
+                                        List[bool]]:
+        """
+        Gera e valida as provas de todos os validadores de cada contexto.
+        
+        Com executor, os validadores de cada contexto são divididos em blocos
+        submetidos ao pool com um número limitado de tarefas pendentes; o laço
+        de eventos fica livre enquanto os blocos rodam. Os resultados são
+        remontados na ordem dos contextos e, dentro de cada um, dos validadores.
+        
+        Se estados mudam durante a rodada, o contexto afetado é refeito (no
+        laço de eventos, ao fim de cada bloco e da rodada) e todos os seus
+        blocos são reprocessados com o novo snapshot. Após
+        MAX_ROUND_RESNAPSHOTS refeituras do próprio contexto (o limite é por
+        contexto, então a agitação de um comitê não afeta os demais), ele deixa de ser refeito e
+        todos os seus blocos são validados com o último snapshot (a
+        tolerância de ΔC absorve a deriva); ele é então marcado como
+        desatualizado.
+        
+        Returns:
+            (contextos finais, resultados agrupados por contexto, indicador de
+            contexto desatualizado ao fim da rodada)
+        """
+        args = (self.baseline_coherence, self.lambda_param, self.fraud_threshold)
+        contexts = list(contexts)
+        executor = self._get_executor()
+        if executor is None:
+            n_workers = chunk_size = None
+        else:
+            n_workers = self.max_workers or getattr(executor, '_max_workers', 4)
+            total = sum(len(context.node_ids) for context in contexts)
+            chunk_size = self.chunk_size or max(1, -(-total // (4 * n_workers)))
+        
+        # Blocos concluídos de cada contexto (início -> resultados) e fila de
+        # blocos a submeter, cada um preso ao contexto em que foi criado
+        done_chunks = [{} for _ in contexts]
+        # Contextos cujo limite de refeituras se esgotou
+        settled = [False] * len(contexts)
+        queue = deque()
+        pending = {}
+        resnapshots = [0] * len(contexts)
+        
+        def schedule(index):
+            context = contexts[index]
+            done_chunks[index] = {}
+            size = chunk_size or max(1, len(context.node_ids))
+            queue.extend((index, context, start)
+                         for start in range(0, len(context.node_ids), size))
         
-        if len(all_states) >= 2:
-            self.baseline_coherence = compute_coherence_parameter(all_states)
+        def check(index):
+            context = contexts[index]
+            if settled[index] or context.is_current(self.state_manager):
+                return
+            fresh = self._resnapshot(context)
+            if fresh is context:
+                return
+            if resnapshots[index] >= MAX_ROUND_RESNAPSHOTS:
+                settled[index] = True
+                return
+            resnapshots[index] += 1
+            contexts[index] = fresh
+            schedule(index)
+        
+        def finish(index, context, start, outcomes):
+            # Resultados de um contexto já substituído são descartados
+            if context is contexts[index]:
+                done_chunks[index][start] = outcomes
+                check(index)
+        
+        for index in range(len(contexts)):
+            schedule(index)
+        
+        loop = asyncio.get_running_loop()
+        while True:
+            if queue and (executor is None or len(pending) < 2 * n_workers):
+                index, context, start = queue.popleft()
+                if context is not contexts[index]:
+                    continue
+                chunk = context.node_ids[start:start + (chunk_size or len(context.node_ids))]
+                if executor is None:
+                    finish(index, context, start, _process_round_chunk(context, chunk, *args))
+                else:
+                    future = loop.run_in_executor(executor, _process_round_chunk,
+                                                  context, chunk, *args)
+                    pending[future] = (index, context, start)
+            elif pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    finish(*pending.pop(future), future.result())
+            else:
+                # Tudo concluído: confirma que nenhum contexto ficou desatualizado
+                for index in range(len(contexts)):
+                    check(index)
+                if not queue:
+                    break
+        
+        grouped = [[outcome for _, outcomes in sorted(chunks.items()) for outcome in outcomes]
+                   for chunks in done_chunks]
+        return contexts, grouped, settled
     
     async def run_consensus_round(self) -> Dict[str, any]:
-        """Executa uma rodada completa de consenso"""
+        """
+        Executa uma rodada completa de consenso.
+        
+        No modo fragmentado (committee_size), cada comitê atinge consenso pela
+        maioria simples de seus membros e a rodada, pela maioria dos comitês.
+        """
         results = {
             'timestamp': time.time(),
             'participating_validators': [],
@@ -261,57 +1361,115 @@ class PoQCConsensus:
             'fraud_detections': []
         }
         
-        # Gera provas de todos os validadores
-        valid_proofs = []
-        for validator in self.validators:
-            try:
-                proof = self.generate_quantum_proof(validator)
-                is_valid, message = self.validate_quantum_proof(proof)
+        # Snapshot único dos estados (um por comitê no modo fragmentado),
+        # compartilhado por toda a rodada
+        if self.committee_size is None:
+            contexts = [self.get_round_context()]
+        else:
+            contexts = self.get_committee_contexts()
+            results['round_number'] = self.round_number
+            results['committees'] = []
+        self.round_number += 1
+        
+        # Gera e valida provas de todos os validadores
+        coherences = []
+        committees_achieved = 0
+        contexts, grouped, stale = await self._process_round(contexts)
+        # Validadores validados com um snapshot que ficou desatualizado durante
+        # a rodada (mudanças de estado além do limite de refeituras)
+        results['stale_validators'] = sum(len(context.node_ids)
+                                          for context, is_stale in zip(contexts, stale)
+                                          if is_stale)
+        if self.committee_size is not None:
+            self._committee_contexts = {nid: context for context in contexts
+                                        for nid in context.node_ids}
+        for context, outcomes, is_stale in zip(contexts, grouped, stale):
+            n_valid = 0
+            for validator, proof, is_valid, message in outcomes:
+                if proof is None:
+                    results['fraud_detections'].append({
+                        'validator': validator,
+                        'reason': message
+                    })
+                    continue
                 
                 if is_valid:
-                    valid_proofs.append(proof)
+                    n_valid += 1
+                    coherences.append(proof['coherence_value'])
                     results['participating_validators'].append(validator)
                 else:
                     results['fraud_detections'].append({
                         'validator': validator,
                         'reason': message
                     })
-                    
-                results['proofs'].append(proof.to_dict())
                 
-            except Exception as e:
-                results['fraud_detections'].append({
-                    'validator': validator,
-                    'reason': f"Error generating proof: {str(e)}"
+                results['proofs'].append(proof)
+                # Provas da rodada não podem ser reapresentadas depois
+                self.replay_cache.add(proof['signature'], proof['timestamp'])
+            
+            if self.committee_size is not None:
+                participation = n_valid / len(context.node_ids) if context.node_ids else 0.0
+                achieved = participation >= 0.51
+                committees_achieved += achieved
+                results['committees'].append({
+                    'size': len(context.node_ids),
+                    'coherence': context.coherence,
+                    'fraud_probability': (
+                        float(compute_fraud_probability(context.coherence, self.baseline_coherence,
+                                                        self.lambda_param))
+                        if self.baseline_coherence is not None else 0.0
+                    ),
+                    'participation_rate': participation,
+                    'consensus_achieved': achieved,
+                    'stale_snapshot': is_stale
                 })
         
         # Calcula estatísticas
-        if valid_proofs:
-            coherences = [proof.coherence_value for proof in valid_proofs]
+        if coherences:
             results['average_coherence'] = np.mean(coherences)
             
-            # Consenso é alcançado se maioria dos validadores participou
-            participation_rate = len(valid_proofs) / len(self.validators)
-            results['consensus_achieved'] = participation_rate >= 0.51  # Maioria simples
+            if self.committee_size is None:
+                # Consenso é alcançado se maioria dos validadores participou
+                participation_rate = len(coherences) / len(self.validators)
+                results['consensus_achieved'] = participation_rate >= 0.51  # Maioria simples
+            else:
+                # Consenso é alcançado se maioria dos comitês o alcançou
+                results['consensus_achieved'] = committees_achieved / len(contexts) >= 0.51
             
             # Atualiza baseline se consenso foi alcançado
             if results['consensus_achieved']:
-                self.update_baseline_coherence()
+                if self.committee_size is None:
+                    # C do snapshot com que as provas foram validadas
+                    if len(contexts[0].node_ids) >= 2:
+                        self.baseline_coherence = contexts[0].coherence
+                else:
+                    # C de comitês diferentes não é comparável ao C global:
+                    # a referência passa a ser a média dos comitês
+                    self.baseline_coherence = float(np.mean(
+                        [context.coherence for context in contexts]
+                    ))
         
         return results
 
 
-def validate_quantum_proof(proof_data: dict, consensus: PoQCConsensus) -> Tuple[bool, str]:
-    """Função auxiliar para validar prova quântica a partir de dados serializados"""
+def validate_quantum_proof(proof_data: Union[dict, BytesLike],
+                           consensus: PoQCConsensus) -> Tuple[bool, str]:
+    """
+    Função auxiliar para validar prova quântica a partir de dados serializados
+    (dicionário de to_dict ou bytes de to_bytes)
+    """
     try:
-        proof = QuantumProof(
-            node_id=proof_data['node_id'],
-            timestamp=proof_data['timestamp'],
-            quantum_state=np.array(proof_data['quantum_state']),
-            pauli_measurements=proof_data['pauli_measurements'],
-            coherence_value=proof_data['coherence_value'],
-            signature=proof_data['signature']
-        )
+        if isinstance(proof_data, (bytes, bytearray, memoryview)):
+            proof = QuantumProof.from_bytes(proof_data)
+        else:
+            proof = QuantumProof(
+                node_id=proof_data['node_id'],
+                timestamp=proof_data['timestamp'],
+                quantum_state=np.array(proof_data['quantum_state']),
+                pauli_measurements=proof_data['pauli_measurements'],
+                coherence_value=proof_data['coherence_value'],
+                signature=proof_data['signature']
+            )
         return consensus.validate_quantum_proof(proof)
     except Exception as e:
-        return False, f"Invalid proof format: {str(e)}"
\ No newline at end of file
+        return False, f"Invalid proof format: {str(e)}"
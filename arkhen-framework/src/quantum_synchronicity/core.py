@@ -8,14 +8,31 @@ Baseado em "Navigating the Open Oceans of Quantum Synchronicity" (OU Physics, 20
 """
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional, Union
+from typing import Any, Iterator, List, Dict, Tuple, Optional, Union
+from collections.abc import Mapping
 from dataclasses import dataclass
 import networkx as nx
+import scipy.sparse as sp
 from qiskit.quantum_info import Statevector, partial_trace, entropy
 from qiskit import QuantumCircuit
 import time
 
 
+# Linhas por bloco no cálculo da matriz de sincronicidade
+SYNC_BLOCK_SIZE = 1024
+
+# 'jacobi': todos os nós avançam a partir dos estados do início do passo
+# 'sequential': nós avançam em ordem, vendo parceiros já atualizados no passo
+UPDATE_MODES = ('jacobi', 'sequential')
+
+# 'dense': matriz N × N de sincronicidades a cada passo; o histórico traz
+#          avg_sync/max_sync de antes do passo e network_coherence de depois
+# 'edges': sincronicidades só ao longo das arestas; estatísticas globais
+#          (matriz densa, O(N²)) só sob demanda ou a cada stats_interval
+#          passos, todas calculadas depois do passo
+SYNC_MODES = ('dense', 'edges')
+
+
 @dataclass
 class SyncParameter:
     """Parâmetros de sincronicidade quântica"""
@@ -24,6 +41,9 @@ class SyncParameter:
     entanglement_threshold: float = 0.5
     sync_frequency: float = 1.0  # Hz
     temperature: float = 0.001  # Kelvin (para átomos ultrafrios)
+    update_mode: str = "jacobi"  # "jacobi" ou "sequential" (ver UPDATE_MODES)
+    sync_mode: str = "dense"  # "dense" ou "edges" (ver SYNC_MODES)
+    stats_interval: Optional[int] = None  # passos entre estatísticas globais no modo "edges" (None: só sob demanda)
 
 
 class SynchronicityMeasure:
@@ -93,19 +113,190 @@ class SynchronicityMeasure:
         phase_sync = np.cos(np.angle(normalized_overlap))
         
         return amplitude_sync, phase_sync
+    
+    @staticmethod
+    def compute_synchronicity_matrix(states: np.ndarray,
+                                     other_states: Optional[np.ndarray] = None,
+                                     block_size: Optional[int] = SYNC_BLOCK_SIZE,
+                                     out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calcula Sᵢⱼ para todos os pares de uma vez: |Ψ Ψᴴ| / (|ψᵢ||ψⱼ|).
+        
+        Os produtos internos ⟨ψᵢ|ψⱼ⟩ saem de uma multiplicação de matrizes
+        (BLAS) sobre os estados empilhados; as normas são calculadas uma vez
+        por estado. Para N grande, as linhas são processadas em blocos de
+        `block_size`, de modo que a matriz complexa intermediária nunca passa
+        de block_size × M.
+        
+        Args:
+            states: Estados empilhados, formato (N, d)
+            other_states: Segundo conjunto (M, d) para a matriz cruzada N × M;
+                se None, calcula a matriz N × N de `states`, com diagonal zero
+            block_size: Linhas por bloco (None: um único bloco)
+            out: Matriz float64 de saída, opcional
+            
+        Returns:
+            Matriz de sincronicidades, limitada a [0, 1]
+        """
+        states = np.asarray(states)
+        symmetric = other_states is None
+        other_states = states if symmetric else np.asarray(other_states)
+        
+        def inverse_norms(psi: np.ndarray) -> np.ndarray:
+            norms = np.linalg.norm(psi, axis=1)
+            # Estados nulos têm sincronicidade zero com todos os demais
+            return np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        
+        inv_i = inverse_norms(states)
+        inv_j = inv_i if symmetric else inverse_norms(other_states)
+        other_h = other_states.T
+        
+        n, m = len(states), len(other_states)
+        if out is None:
+            out = np.empty((n, m))
+        block_size = block_size or max(n, 1)
+        
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = out[start:stop]
+            np.abs(states[start:stop].conj() @ other_h, out=block)
+            block *= inv_i[start:stop, np.newaxis]
+            block *= inv_j[np.newaxis, :]
+        
+        np.minimum(out, 1.0, out=out)  # Limita a 1.0
+        if symmetric:
+            np.fill_diagonal(out, 0.0)
+        return out
+    
+    @staticmethod
+    def compute_pair_synchronicity(states: np.ndarray, rows: np.ndarray,
+                                   cols: np.ndarray) -> np.ndarray:
+        """
+        Calcula Sᵢⱼ apenas para os pares (rows[k], cols[k]), com produtos
+        internos das linhas reunidas em lote: O(pares·d).
+        
+        Mantém as convenções da matriz completa: limite em 1.0, zero para
+        estados nulos e para i == j.
+        """
+        states = np.asarray(states)
+        norms = np.linalg.norm(states, axis=1)
+        inv_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        
+        overlaps = np.einsum('ij,ij->i', states[rows].conj(), states[cols])
+        values = np.abs(overlaps) * inv_norms[rows] * inv_norms[cols]
+        np.minimum(values, 1.0, out=values)
+        values[rows == cols] = 0.0
+        return values
+
+
+class _NodeRecord(Mapping):
+    """
+    Visão {'state', 'last_update', 'sync_partners'} de um nó, apoiada nos
+    arrays da rede. 'state' é a linha do nó na matriz de estados (somente
+    leitura); atribuir record['state'] grava nessa linha e incrementa a
+    versão dos estados da rede. 'sync_partners' é lido como frozenset;
+    atribuí-lo invalida o acoplamento e incrementa a versão da topologia.
+    """
+    
+    KEYS = ('state', 'last_update', 'sync_partners')
+    
+    def __init__(self, network: 'EntanglementNetwork', row: int):
+        self._network = network
+        self._row = row
+    
+    def __getitem__(self, key: str) -> Any:
+        network = self._network
+        if key == 'state':
+            state = network._states[self._row]
+            state.flags.writeable = False  # Escritas passam por __setitem__
+            return state
+        if key == 'last_update':
+            return float(network._last_update[self._row])
+        if key == 'sync_partners':
+            return frozenset(network._sync_partners[self._row])
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        network = self._network
+        if key == 'state':
+            network._states[self._row] = value
+            network.state_version += 1
+        elif key == 'last_update':
+            network._last_update[self._row] = value
+        elif key == 'sync_partners':
+            partners = set(value)
+            if not partners <= network.node_index.keys():
+                raise ValueError("All sync partners must exist in the network")
+            network._sync_partners[self._row] = partners
+            network._coupling = None
+            network.topology_version += 1
+        else:
+            raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+    
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+
+class _NodeView(Mapping):
+    """Visão {node_id: registro do nó} sobre o armazenamento da rede"""
+    
+    def __init__(self, network: 'EntanglementNetwork'):
+        self._network = network
+    
+    def __getitem__(self, node_id: str) -> _NodeRecord:
+        return _NodeRecord(self._network, self._network.node_index[node_id])
+    
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._network.node_index
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._network.node_ids)
+    
+    def __len__(self) -> int:
+        return len(self._network.node_ids)
 
 
 class EntanglementNetwork:
     """
     Rede de entrelaçamento quântico para sincronicidade em larga escala.
+    
+    Os estados dos nós ficam numa matriz complexa contígua (N, d), uma linha
+    por nó na ordem de inserção, com o mapa node_index {id: linha}.
+    `nodes` continua acessível como dicionário: nodes[id]['state'] é a
+    linha do nó na matriz.
+    
+    A matriz de sincronicidades e suas estatísticas são calculadas no máximo
+    uma vez por versão dos estados (state_version) e compartilhadas por
+    evolve_network, compute_network_coherence, detect_sync_clusters e pelo
+    QuantumSynchronizer. As matrizes em cache são somente leitura.
     """
     
     def __init__(self, n_nodes: int, parameters: SyncParameter):
         self.n_nodes = n_nodes
         self.params = parameters
-        self.nodes = {}
+        self.node_ids: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self._states = None  # Alocado no primeiro nó, quando d é conhecido
+        self._last_update = np.zeros(max(n_nodes, 1))
+        self._sync_partners: List[set] = []
+        # Padrão CSR do acoplamento (pares de parceiros), refeito sob demanda
+        self._coupling = None
+        self._coupling_rows = None
+        self.step_count = 0
+        # Versões dos estados e das arestas: qualquer escrita em estados (ou
+        # nova aresta) as incrementa e invalida as sincronicidades em cache
+        self.state_version = 0
+        self.topology_version = 0
+        self._sync_cache = None   # (state_version, matriz densa)
+        self._stats_cache = None  # (state_version, média dos Sᵢⱼ > 0, máximo)
+        self._edge_cache = None   # (state_version, topology_version, CSR)
+        self.nodes = _NodeView(self)
         self.graph = nx.Graph()
-        self.entanglement_matrix = np.zeros((n_nodes, n_nodes))
+        # Capacidade acompanha a de _states; entanglement_matrix é a visão (N, N)
+        self._entanglement = np.zeros((n_nodes, n_nodes))
         self.sync_history = []
         
         # Inicializa nós
@@ -113,73 +304,258 @@ class EntanglementNetwork:
             node_id = f"node_{i}"
             self.add_node(node_id)
     
+    def _ensure_capacity(self, n: int, dim: int):
+        """Aloca ou dobra os arrays dos nós até comportar n linhas"""
+        if self._states is None:
+            self._states = np.zeros((max(n, self.n_nodes, 1), dim), dtype=complex)
+        elif self._states.shape[1] != dim:
+            raise ValueError(f"Node state dimension {dim} does not match "
+                             f"network dimension {self._states.shape[1]}")
+        
+        capacity = len(self._states)
+        if n > capacity:
+            while capacity < n:
+                capacity *= 2
+            states = np.zeros((capacity, dim), dtype=complex)
+            states[:len(self._states)] = self._states
+            self._states = states
+        
+        if n > len(self._last_update):
+            last_update = np.zeros(len(self._states))
+            last_update[:len(self._last_update)] = self._last_update
+            self._last_update = last_update
+        
+        if n > len(self._entanglement):
+            size = len(self._entanglement)
+            grown = np.zeros((len(self._states), len(self._states)))
+            grown[:size, :size] = self._entanglement
+            self._entanglement = grown
+    
+    @property
+    def entanglement_matrix(self) -> np.ndarray:
+        """Forças de entrelaçamento (N, N) entre os nós (visão do buffer interno)"""
+        n = len(self.node_ids)
+        return self._entanglement[:n, :n]
+    
+    @entanglement_matrix.setter
+    def entanglement_matrix(self, value: np.ndarray):
+        self._entanglement = np.array(value, dtype=float)
+    
     def add_node(self, node_id: str, initial_state: Optional[np.ndarray] = None):
         """Adiciona um nó à rede"""
         if initial_state is None:
             # Estado inicial aleatório
             dim = 4  # Sistema de 2 qubits
-            initial_state = np.random.complex128(dim) + 1j * np.random.random(dim)
+            initial_state = np.random.random(dim) + 1j * np.random.random(dim)
             initial_state = initial_state / np.linalg.norm(initial_state)
         
-        self.nodes[node_id] = {
-            'state': initial_state,
-            'last_update': time.time(),
-            'sync_partners': set()
-        }
+        if node_id in self.node_index:
+            row = self.node_index[node_id]
+        else:
+            row = len(self.node_ids)
+            self._ensure_capacity(row + 1, len(initial_state))
+            self.node_ids.append(node_id)
+            self.node_index[node_id] = row
+            self._sync_partners.append(set())
+        
+        self._states[row] = initial_state
+        self._last_update[row] = time.time()
+        self._sync_partners[row] = set()
+        self._coupling = None
+        self.state_version += 1
+        self.topology_version += 1
         self.graph.add_node(node_id)
     
+    def get_state_matrix(self) -> np.ndarray:
+        """
+        Estados de todos os nós, formato (N, d), na ordem dos nós
+        (visão somente leitura da matriz de estados).
+        """
+        if self._states is None:
+            return np.zeros((0, 0), dtype=complex)
+        states = self._states[:len(self.node_ids)]
+        states.flags.writeable = False
+        return states
+    
     def create_entanglement(self, node_i: str, node_j: str, strength: float = 1.0):
         """Cria entrelaçamento entre dois nós"""
-        if node_i not in self.nodes or node_j not in self.nodes:
+        if node_i not in self.node_index or node_j not in self.node_index:
             raise ValueError("Both nodes must exist in the network")
         
         # Adiciona aresta no grafo
         self.graph.add_edge(node_i, node_j, weight=strength)
         
         # Atualiza matriz de entrelaçamento
-        i_idx = list(self.nodes.keys()).index(node_i)
-        j_idx = list(self.nodes.keys()).index(node_j)
-        self.entanglement_matrix[i_idx, j_idx] = strength
-        self.entanglement_matrix[j_idx, i_idx] = strength
+        i_idx = self.node_index[node_i]
+        j_idx = self.node_index[node_j]
+        self._entanglement[i_idx, j_idx] = strength
+        self._entanglement[j_idx, i_idx] = strength
         
         # Marca como parceiros sincronizados
-        self.nodes[node_i]['sync_partners'].add(node_j)
-        self.nodes[node_j]['sync_partners'].add(node_i)
+        self._sync_partners[i_idx].add(node_j)
+        self._sync_partners[j_idx].add(node_i)
+        self._coupling = None
+        self.topology_version += 1
     
-    def evolve_network(self, dt: float):
-        """Evolui a rede por um passo de tempo dt"""
-        current_time = time.time()
+    def evolve_network(self, dt: float, update_mode: Optional[str] = None,
+                       sync_mode: Optional[str] = None):
+        """
+        Evolui a rede por um passo de tempo dt.
         
-        # Calcula sincronicidades atuais
-        sync_matrix = self.compute_synchronicity_matrix()
+        Args:
+            dt: Passo de tempo
+            update_mode: 'jacobi' (todos os nós a partir dos estados do início
+                do passo, em lote) ou 'sequential' (nó a nó, na ordem da rede,
+                cada um vendo os parceiros já atualizados); padrão:
+                params.update_mode
+            sync_mode: 'dense' (matriz completa a cada passo; o histórico
+                registra avg_sync/max_sync de antes do passo) ou 'edges'
+                (sincronicidades só entre parceiros; o histórico só é
+                registrado se params.stats_interval for dado, a cada tantos
+                passos, com todas as estatísticas de depois do passo; senão,
+                use compute_sync_statistics); padrão: params.sync_mode
+        """
+        update_mode = update_mode or self.params.update_mode
+        sync_mode = sync_mode or self.params.sync_mode
+        if update_mode not in UPDATE_MODES:
+            raise ValueError(f"Unknown update mode '{update_mode}', "
+                             f"expected one of {UPDATE_MODES}")
+        if sync_mode not in SYNC_MODES:
+            raise ValueError(f"Unknown sync mode '{sync_mode}', "
+                             f"expected one of {SYNC_MODES}")
+        current_time = time.time()
         
-        # Evolui cada nó baseado nas interações
-        for node_id, node_data in self.nodes.items():
-            new_state = self._evolve_node_state(
-                node_id, node_data['state'], sync_matrix, dt
+        # Calcula sincronicidades atuais (matriz completa ou só nas arestas)
+        if sync_mode == 'dense':
+            sync_matrix = self.compute_synchronicity_matrix()
+            avg_sync, max_sync = self._sync_statistics()
+        else:
+            sync_matrix = self.compute_edge_synchronicity()
+        
+        if update_mode == 'jacobi':
+            self._evolve_jacobi(sync_matrix, dt)
+        else:
+            # Evolui cada nó baseado nas interações; cada linha é gravada na
+            # hora, então nós seguintes já veem os parceiros atualizados
+            for node_idx, node_id in enumerate(self.node_ids):
+                self._states[node_idx] = self._evolve_node_state(
+                    node_id, self._states[node_idx], sync_matrix, dt
+                )
+        self.state_version += 1
+        self._last_update[:len(self.node_ids)] = current_time
+        self.step_count += 1
+        
+        # Salva histórico (estatísticas anteriores ao passo vêm do cache;
+        # a matriz após o passo é reaproveitada pelo próximo passo)
+        if sync_mode == 'dense':
+            self.sync_history.append({
+                'time': current_time,
+                'avg_sync': avg_sync,
+                'max_sync': max_sync,
+                'network_coherence': self.compute_network_coherence()
+            })
+        elif (self.params.stats_interval is not None
+              and self.step_count % max(self.params.stats_interval, 1) == 0):
+            self.sync_history.append(self.compute_sync_statistics(current_time))
+    
+    def compute_edge_synchronicity(self) -> sp.csr_matrix:
+        """
+        Sincronicidades Sᵢⱼ apenas entre parceiros, como matriz CSR simétrica
+        com o padrão do acoplamento (em cache por versão dos estados e arestas).
+        """
+        key = (self.state_version, self.topology_version)
+        if self._edge_cache is not None and self._edge_cache[:2] == key:
+            return self._edge_cache[2]
+        
+        pattern = self._coupling_pattern()
+        values = SynchronicityMeasure.compute_pair_synchronicity(
+            self.get_state_matrix(), self._coupling_rows, pattern.indices
+        )
+        values.flags.writeable = False
+        edge_sync = sp.csr_matrix((values, pattern.indices, pattern.indptr), shape=pattern.shape)
+        self._edge_cache = key + (edge_sync,)
+        return edge_sync
+    
+    def _sync_statistics(self) -> Tuple[float, float]:
+        """(média dos Sᵢⱼ > 0, máximo) da matriz atual, uma vez por versão"""
+        if self._stats_cache is None or self._stats_cache[0] != self.state_version:
+            sync_matrix = self.compute_synchronicity_matrix()
+            self._stats_cache = (self.state_version,
+                                 np.mean(sync_matrix[sync_matrix > 0]),
+                                 np.max(sync_matrix))
+        return self._stats_cache[1], self._stats_cache[2]
+    
+    def compute_sync_statistics(self, timestamp: Optional[float] = None) -> Dict[str, float]:
+        """
+        Estatísticas globais (matriz densa, O(N²)) dos estados atuais, no
+        formato do histórico; no modo 'edges', é assim que são obtidas
+        sob demanda.
+        """
+        avg_sync, max_sync = self._sync_statistics()
+        return {
+            'time': time.time() if timestamp is None else timestamp,
+            'avg_sync': avg_sync,
+            'max_sync': max_sync,
+            'network_coherence': avg_sync
+        }
+    
+    def _coupling_pattern(self) -> sp.csr_matrix:
+        """Matriz CSR simétrica com uma entrada por par de parceiros"""
+        if self._coupling is None:
+            n = len(self.node_ids)
+            rows, cols = [], []
+            for i, partners in enumerate(self._sync_partners):
+                for partner_id in partners:
+                    rows.append(i)
+                    cols.append(self.node_index[partner_id])
+            
+            pattern = sp.csr_matrix(
+                (np.ones(len(rows)), (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp))),
+                shape=(n, n)
             )
-            self.nodes[node_id]['state'] = new_state
-            self.nodes[node_id]['last_update'] = current_time
+            pattern.sum_duplicates()
+            self._coupling = pattern
+            # Linha de cada entrada não nula, para indexar a matriz densa
+            self._coupling_rows = np.repeat(np.arange(n), np.diff(pattern.indptr))
+        return self._coupling
+    
+    def _evolve_jacobi(self, sync_matrix: Union[np.ndarray, sp.csr_matrix], dt: float):
+        """
+        Passo síncrono: Ψ ← normaliza(e^{-iωdt}·Ψ + dt·K·Ψ), com
+        Kᵢⱼ = coupling_strength·Sᵢⱼ para cada par de parceiros, em CSR.
+        Custo O(arestas·d) além da matriz de sincronicidades, que pode ser
+        densa ou já restrita às arestas (compute_edge_synchronicity).
+        """
+        n = len(self.node_ids)
+        if n == 0:
+            return
+        coupling = self._coupling_pattern()
+        if sp.issparse(sync_matrix):
+            # Mesmo padrão CSR: os valores já estão na ordem das entradas
+            edge_sync = sync_matrix.data
+        else:
+            edge_sync = sync_matrix[self._coupling_rows, coupling.indices]
+        coupling.data = self.params.coupling_strength * edge_sync
+        
+        states = self._states[:n]
+        phase_factor = np.exp(-1j * self.params.sync_frequency * dt)
+        evolved = phase_factor * states + dt * (coupling @ states)
         
-        # Salva histórico
-        self.sync_history.append({
-            'time': current_time,
-            'avg_sync': np.mean(sync_matrix[sync_matrix > 0]),
-            'max_sync': np.max(sync_matrix),
-            'network_coherence': self.compute_network_coherence()
-        })
+        # Renormaliza todas as linhas de uma vez
+        evolved /= np.linalg.norm(evolved, axis=1)[:, np.newaxis]
+        states[:] = evolved
     
     def _evolve_node_state(self, node_id: str, state: np.ndarray, 
                           sync_matrix: np.ndarray, dt: float) -> np.ndarray:
         """Evolui o estado de um nó baseado nas sincronicidades"""
-        node_idx = list(self.nodes.keys()).index(node_id)
+        node_idx = self.node_index[node_id]
         
         # Hamiltoniano de interação baseado em sincronicidades
         interaction_term = np.zeros_like(state)
         
-        for partner_id in self.nodes[node_id]['sync_partners']:
-            partner_idx = list(self.nodes.keys()).index(partner_id)
-            partner_state = self.nodes[partner_id]['state']
+        for partner_id in self._sync_partners[node_idx]:
+            partner_idx = self.node_index[partner_id]
+            partner_state = self._states[partner_idx]
             
             sync_value = sync_matrix[node_idx, partner_idx]
             coupling = self.params.coupling_strength * sync_value
@@ -194,44 +570,44 @@ class EntanglementNetwork:
         # Renormaliza
         return evolved_state / np.linalg.norm(evolved_state)
     
-    def compute_synchronicity_matrix(self) -> np.ndarray:
-        """Calcula matriz de sincronicidades entre todos os nós"""
-        n = len(self.nodes)
-        sync_matrix = np.zeros((n, n))
-        
-        node_ids = list(self.nodes.keys())
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                state_i = self.nodes[node_ids[i]]['state']
-                state_j = self.nodes[node_ids[j]]['state']
-                
-                sync_value = SynchronicityMeasure.compute_synchronicity(state_i, state_j)
-                sync_matrix[i, j] = sync_value
-                sync_matrix[j, i] = sync_value
+    def compute_synchronicity_matrix(self, block_size: Optional[int] = SYNC_BLOCK_SIZE) -> np.ndarray:
+        """
+        Calcula matriz de sincronicidades entre todos os nós (diagonal zero).
         
+        O resultado fica em cache até a próxima escrita em estados e é
+        retornado como array somente leitura.
+        """
+        if self._sync_cache is not None and self._sync_cache[0] == self.state_version:
+            return self._sync_cache[1]
+        
+        if not self.node_ids:
+            sync_matrix = np.zeros((0, 0))
+        else:
+            sync_matrix = SynchronicityMeasure.compute_synchronicity_matrix(
+                self.get_state_matrix(), block_size=block_size
+            )
+        sync_matrix.flags.writeable = False
+        self._sync_cache = (self.state_version, sync_matrix)
         return sync_matrix
     
     def compute_network_coherence(self) -> float:
         """Calcula coerência global da rede"""
-        sync_matrix = self.compute_synchronicity_matrix()
-        return np.mean(sync_matrix[sync_matrix > 0])
+        return self._sync_statistics()[0]
     
     def detect_sync_clusters(self, threshold: float = 0.7) -> List[List[str]]:
         """Detecta clusters de nós altamente sincronizados"""
         sync_matrix = self.compute_synchronicity_matrix()
-        node_ids = list(self.nodes.keys())
+        node_ids = self.node_ids
         
         # Cria grafo de sincronicidade
         sync_graph = nx.Graph()
         sync_graph.add_nodes_from(node_ids)
         
-        n = len(node_ids)
-        for i in range(n):
-            for j in range(i + 1, n):
-                if sync_matrix[i, j] > threshold:
-                    sync_graph.add_edge(node_ids[i], node_ids[j], 
-                                      weight=sync_matrix[i, j])
+        rows, cols = np.nonzero(np.triu(sync_matrix > threshold, k=1))
+        sync_graph.add_weighted_edges_from(
+            (node_ids[i], node_ids[j], sync_matrix[i, j])
+            for i, j in zip(rows.tolist(), cols.tolist())
+        )
         
         # Encontra componentes conectados
         clusters = list(nx.connected_components(sync_graph))
@@ -267,7 +643,8 @@ class QuantumSynchronizer:
             dt: Passo de tempo
             
         Returns:
-            Dados do experimento
+            Dados do experimento ('history' fica vazio no modo 'edges' sem
+            stats_interval; as coerências inicial e final são sempre calculadas)
         """
         if network_id not in self.networks:
             raise ValueError(f"Network {network_id} not found")
@@ -280,6 +657,7 @@ class QuantumSynchronizer:
         
         # Executa evolução
         steps = int(duration / dt)
+        history_start = len(network.sync_history)
         for step in range(steps):
             network.evolve_network(dt)
         
@@ -296,7 +674,7 @@ class QuantumSynchronizer:
             'final_coherence': final_coherence,
             'coherence_change': final_coherence - initial_coherence,
             'sync_clusters': sync_clusters,
-            'history': network.sync_history[-steps:],
+            'history': network.sync_history[history_start:],
             'final_sync_matrix': network.compute_synchronicity_matrix().tolist()
         }
         
@@ -315,15 +693,10 @@ class QuantumSynchronizer:
         for i, net_i in enumerate(network_ids):
             for j, net_j in enumerate(network_ids[i+1:], i+1):
                 # Sincronicidade média entre nós de diferentes redes
-                sync_values = []
-                
-                for node_i in self.networks[net_i].nodes:
-                    for node_j in self.networks[net_j].nodes:
-                        state_i = self.networks[net_i].nodes[node_i]['state']
-                        state_j = self.networks[net_j].nodes[node_j]['state']
-                        
-                        sync = SynchronicityMeasure.compute_synchronicity(state_i, state_j)
-                        sync_values.append(sync)
+                sync_values = SynchronicityMeasure.compute_synchronicity_matrix(
+                    self.networks[net_i].get_state_matrix(),
+                    self.networks[net_j].get_state_matrix()
+                )
                 
                 inter_network_sync[f"{net_i}_{net_j}"] = {
                     'mean_sync': np.mean(sync_values),